@@ -53,6 +53,7 @@ def register():
     bpy.types.TOPBAR_MT_file_import.prepend(menu_func_import)
     bpy.types.TOPBAR_MT_file_export.prepend(menu_func_export)
     bpy.types.VIEW3D_MT_edit_armature_names.append(operators.rename_bones.menu_func)
+    operators.rename_bones.register_handlers()
 
     scene_props.add_custom_properties()
     shape_sliders.add_scene_property()
@@ -63,6 +64,7 @@ def unregister():
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
     bpy.types.TOPBAR_MT_file_export.remove(menu_func_export)
     bpy.types.VIEW3D_MT_edit_armature_names.remove(operators.rename_bones.menu_func)
+    operators.rename_bones.unregister_handlers()
     classes.bpy_unregister()
 
 
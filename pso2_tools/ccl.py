@@ -1,6 +1,7 @@
 import os
 import struct
 from dataclasses import dataclass
+from itertools import starmap
 from typing import BinaryIO
 
 
@@ -13,7 +14,7 @@ def int_to_color(value: int) -> tuple[float, float, float, float]:
     return (r, g, b, a)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Pso2CclColorSet:
     id: int
     outerwear1: int
@@ -37,7 +38,8 @@ class Pso2CclColorSet:
 
 
 _COLOR_SET_FORMAT = "<IIIIIII"
-_COLOR_SIZE = struct.calcsize(_COLOR_SET_FORMAT)
+_COLOR_SET_STRUCT = struct.Struct(_COLOR_SET_FORMAT)
+_COLOR_SIZE = _COLOR_SET_STRUCT.size
 
 
 class Pso2Ccl:
@@ -76,9 +78,10 @@ class Pso2Ccl:
         if int(array_count) != array_count:
             raise ValueError("Array size is incorrect")
 
-        color_sets = []
-        for _ in range(int(array_count)):
-            item = struct.unpack(_COLOR_SET_FORMAT, fp.read(_COLOR_SIZE))
-            color_sets.append(Pso2CclColorSet(*item))
+        data = fp.read(int(array_count) * _COLOR_SIZE)
+        if len(data) != int(array_count) * _COLOR_SIZE:
+            raise ValueError("Unexpected end of file")
+
+        color_sets = list(starmap(Pso2CclColorSet, _COLOR_SET_STRUCT.iter_unpack(data)))
 
         return Pso2Ccl(color_sets)
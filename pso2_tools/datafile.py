@@ -1,5 +1,8 @@
 from collections.abc import Iterable
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    import System
 
 
 class DataFile(Protocol):
@@ -9,6 +12,9 @@ class DataFile(Protocol):
     @property
     def data(self) -> bytes: ...
 
+    def to_byte_array(self) -> "bytes | System.Array[int]":
+        """Get the contents to pass to a .NET method that takes a byte[]"""
+
 
 class DataFileSource(Protocol):
     def get_files(self) -> Iterable[DataFile]: ...
@@ -23,29 +23,36 @@ _DOTNET_ROOT = Path("C:/Program Files/dotnet")
 _loaded = False
 _probing_paths_set = False
 
+# Assemblies stay loaded in the runtime when the add-on is reloaded, so keep
+# track of them across importlib.reload() instead of referencing them again.
+_referenced: set[str] = globals().get("_referenced", set())
+
 
 def load():
     global _loaded
     if _loaded:
         return
 
-    try:
-        if _DOTNET_ROOT.exists():
-            rt = clr_loader.get_coreclr(dotnet_root=_DOTNET_ROOT)
-            pythonnet.load(rt)
-        else:
-            pythonnet.load("coreclr")
-    except RuntimeError:
-        # The runtime is already loaded, e.g. when the extension is
-        # re-enabled after an update. It cannot be unloaded, but referencing
-        # assemblies again is harmless.
-        pass
+    if pythonnet.get_runtime_info() is None:
+        try:
+            if _DOTNET_ROOT.exists():
+                rt = clr_loader.get_coreclr(dotnet_root=_DOTNET_ROOT)
+                pythonnet.load(rt)
+            else:
+                pythonnet.load("coreclr")
+        except RuntimeError:
+            # The runtime is already loaded, e.g. when the extension is
+            # re-enabled after an update. It cannot be unloaded, but
+            # referencing assemblies again is harmless.
+            pass
 
     import clr
 
     for name in _DLL_NAMES:
         path = str(BIN_PATH / name)
-        clr.AddReference(path)  # type: ignore
+        if path not in _referenced:
+            clr.AddReference(path)  # type: ignore
+            _referenced.add(path)
 
     _loaded = True
 
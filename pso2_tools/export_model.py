@@ -54,6 +54,9 @@ class FbxExportOptions(TypedDict, total=False):
     prioritize_active_color: bool
 
 
+_FBX_OPTION_KEYS = frozenset(get_type_hints(FbxExportOptions))
+
+
 class ExportOptions(FbxExportOptions, total=False):
     rigid: bool
     override_bounding_radius: bool
@@ -79,6 +82,8 @@ def export(
     overwrite_aqn=False,
     options: ExportOptions | None = None,
 ) -> OperatorResult:
+    dotnet.load()
+
     from AquaModelLibrary.Core.General import AssimpModelImporter
     from AquaModelLibrary.Data.PSO2.Aqua import AquaNode, AquaObject, AquaPackage
 
@@ -281,9 +286,14 @@ def _include_parents(context: bpy.types.Context, fbx_options: ExportOptions):
     try:
         # If we are only including visible objects, make sure the parents of any
         # visible objects are also visible.
+        # Meshes often share parents, so stop walking up once we reach one that
+        # was already handled.
         if use_visible:
+            visited: set[bpy.types.Object] = set()
             for obj in _get_visible_meshes(ctx_objects):
-                while obj := obj.parent:
+                while (obj := obj.parent) and obj not in visited:
+                    visited.add(obj)
+
                     if obj.hide_get():
                         obj.hide_set(False)
                         shown_objects.add(obj)
@@ -295,9 +305,12 @@ def _include_parents(context: bpy.types.Context, fbx_options: ExportOptions):
         # If we are only including selected objects, make sure the parents of any
         # selected objects are also selected.
         if use_selection:
-            selection = set(context.selected_objects or [])
+            selection = set(ctx_objects)
+            visited: set[bpy.types.Object] = set()
             for obj in _get_selected_meshes(ctx_objects):
-                while obj := obj.parent:
+                while (obj := obj.parent) and obj not in visited:
+                    visited.add(obj)
+
                     if not obj.select_get():
                         selection.add(obj)
 
@@ -322,10 +335,7 @@ def _get_selected_meshes(objects: Iterable[bpy.types.Object]):
 
 
 def _get_fbx_options(options: ExportOptions):
-    result = FbxExportOptions()
-
-    for key in get_type_hints(FbxExportOptions):
-        if key in options:
-            result[key] = options[key]
-
-    return result
+    return cast(
+        "FbxExportOptions",
+        {key: options[key] for key in _FBX_OPTION_KEYS & options.keys()},
+    )
@@ -1,8 +1,9 @@
-import ast
 import re
+from collections.abc import Iterable
 from contextlib import contextmanager
-from pathlib import Path
+from functools import lru_cache
 
+import bpy
 import io_scene_fbx.export_fbx_bin
 import io_scene_fbx.import_fbx
 
@@ -38,15 +39,42 @@ BONE_PATTERN_2 = re.compile(r"^(.+(?:#.+(?:#.+)?)?)\((\d+)\)$")
 "Matches `name#short1#short2(id)`, the format used by older versions of this add-on"
 
 
+BONE_ID_PATTERN = re.compile(
+    r"^(?:\((?P<id>\d+)\)(?P<name>.+(?:#.+(?:#.+)?)?)"
+    r"|(?P<name_2>.+(?:#.+(?:#.+)?)?)\((?P<id_2>\d+)\))$"
+)
+"Matches either `BONE_PATTERN` or `BONE_PATTERN_2`, preferring the first"
+
+
+def has_bone_id(name: str) -> bool:
+    """Same as `BONE_ID_PATTERN.match(name)`, but without the regex engine"""
+    if name.startswith("("):
+        end = name.find(")")
+        if end > 1 and end < len(name) - 1 and name[1:end].isdecimal():
+            return True
+
+    if name.endswith(")"):
+        start = name.rfind("(")
+        if start > 0 and start < len(name) - 2 and name[start + 1 : -1].isdecimal():
+            return True
+
+    return False
+
+
+@lru_cache(maxsize=4096)
 def split_bone_name(name: str) -> tuple[str, int] | None:
-    if m := BONE_PATTERN.match(name):
-        return m.group(2), int(m.group(1))
+    # Most nodes that aren't bones have no ID at either end, so skip the regex
+    if not (name.startswith("(") or name.endswith(")")):
+        return None
 
-    # For models imported with the previous renaming that moved the ID to the end
-    if m := BONE_PATTERN_2.match(name):
-        return m.group(1), int(m.group(2))
+    if not (m := BONE_ID_PATTERN.match(name)):
+        return None
 
-    return None
+    if (bone_id := m.group("id")) is not None:
+        return m.group("name"), int(bone_id)
+
+    # For models imported with the previous renaming that moved the ID to the end
+    return m.group("name_2"), int(m.group("id_2"))
 
 
 def join_bone_name(name: str, bone_id: int):
@@ -82,119 +110,75 @@ def _monkey_patch_FbxImportHelperNode():
         yield
     finally:
         io_scene_fbx.import_fbx.FbxImportHelperNode = orig
+        split_bone_name.cache_clear()
 
 
-def _find_function(mod: ast.Module, name: str):
-    return next(
-        n for n in mod.body if isinstance(n, ast.FunctionDef) and n.name == name
-    )
+def _get_export_bone_names(bones: Iterable[bpy.types.Bone]) -> dict[bytes, bytes]:
+    # If a bone has a "pso2_bone_id" custom property, maps its name to "(id)name"
+    return {
+        bone.name.encode(): join_bone_name(bone.name, bone_id).encode()
+        for bone in bones
+        if (bone_id := bone.get(scene_props.BONE_ID)) is not None
+    }
 
 
-def _compile_function(source: str):
-    mod = ast.parse(source, filename="<export_fbx_bin patched>")
-    return next(n for n in mod.body if isinstance(n, ast.FunctionDef))
-
-
-def _get_patched_export_funcs():
-    # There's no convenient function to replace in the export code. Instead of
-    # putting complete copies of the code with patches here, parse the source
-    # code and apply patches to the AST to make new functions.
-
-    # If a bone has a "pso2_bone_id" custom property, returns "(id)name"
-    # Parameter may be io_scene_fbx.fbx_utils.ObjectWrapper or bpy.types.Bone
-    get_bone_name = _compile_function(
-        """\
-def pso2_get_bone_name(bone):
-    search = [bone]
-
-    if bdata := getattr(bone, 'bdata', None):
-        search.append(bdata)
-
-    for obj in search:
-        try:
-            bone_id = obj["pso2_bone_id"]
-            return f"({bone_id}){obj.name}"
-        except (KeyError, TypeError):
-            pass
-
-    return bone.name
-""",
-    )
-
-    class RewriteFbxNameClass(ast.NodeTransformer):
-        def visit_Call(self, node):
-            self.generic_visit(node)
-
-            # replace fbx_name_class(<var>.name.encode(), <cls>)
-            # with    fbx_name_class(pso2_get_bone_name(<var>).encode(), <cls>)
-            match node:
-                case ast.Call(
-                    func=ast.Name("fbx_name_class"),
-                    args=[
-                        ast.Call(
-                            func=ast.Attribute(
-                                ast.Attribute(value=ast.Name(id=name), attr="name"),
-                                attr="encode",
-                            ),
-                            args=[],
-                            keywords=[],
-                        ),
-                        cls,
-                    ],
-                    keywords=[],
-                ):
-                    return ast.Call(
-                        func=ast.Name("fbx_name_class"),
-                        args=[
-                            ast.Call(
-                                ast.Attribute(
-                                    value=ast.Call(
-                                        func=ast.Name("pso2_get_bone_name"),
-                                        args=[ast.Name(id=name)],
-                                        keywords=[],
-                                    ),
-                                    attr="encode",
-                                ),
-                                args=[],
-                                keywords=[],
-                            ),
-                            cls,
-                        ],
-                        keywords=[],
-                    )
-
-                case _:
-                    return node
-
-    def patch_function(mod: ast.Module, name: str):
-        func = _find_function(mod, name)
-        func.body.insert(0, get_bone_name)
-        func = ast.fix_missing_locations(RewriteFbxNameClass().visit(func))
-
-        ns = {}
-        exec(ast.unparse(func), io_scene_fbx.export_fbx_bin.__dict__, ns)
-        return ns[name]
-
-    module_path = Path(io_scene_fbx.export_fbx_bin.__spec__.origin)
-    source = module_path.read_text(encoding="utf-8")
-    mod = ast.parse(source, filename="<export_fbx_bin patched>")
-
-    fbx_data_armature_elements = patch_function(mod, "fbx_data_armature_elements")
-    fbx_data_object_elements = patch_function(mod, "fbx_data_object_elements")
-
-    return fbx_data_armature_elements, fbx_data_object_elements
+_BONE_NAME_CLASSES = frozenset((b"Model", b"NodeAttribute", b"SubDeformer"))
+"FBX element classes whose names are bone names"
 
 
 @contextmanager
 def _monkey_patch_export_fbx_bin():
+    # There's no convenient function to replace in the export code, but every
+    # bone name it writes goes through fbx_name_class(). Wrap the functions
+    # that write bone names so they fill in the names to replace, and have
+    # fbx_name_class() swap them while they run.
+    orig_name_class = io_scene_fbx.export_fbx_bin.fbx_name_class
     orig_armature_elements = io_scene_fbx.export_fbx_bin.fbx_data_armature_elements
     orig_object_elements = io_scene_fbx.export_fbx_bin.fbx_data_object_elements
-    new_armature_elements, new_object_elements = _get_patched_export_funcs()
+
+    # Both functions write the same bones, so build each armature's names once
+    # per export, keyed by the armature's pointer.
+    armature_bone_names: dict[int, dict[bytes, bytes]] = {}
+    bone_names: dict[bytes, bytes] = {}
+
+    def get_bone_names(armature: bpy.types.Armature):
+        key = armature.as_pointer()
+        if (names := armature_bone_names.get(key)) is None:
+            names = armature_bone_names[key] = _get_export_bone_names(armature.bones)
+        return names
+
+    def fbx_name_class(name: bytes, cls: bytes):
+        # Only bones get renamed, not the deformers or bind poses written
+        # alongside them, which may share an armature's bone name.
+        if cls in _BONE_NAME_CLASSES:
+            name = bone_names.get(name, name)
+        return orig_name_class(name, cls)
+
+    def fbx_data_armature_elements(root, arm_obj, scene_data):
+        nonlocal bone_names
+        bone_names = get_bone_names(arm_obj.bdata.data)
+        try:
+            return orig_armature_elements(root, arm_obj, scene_data)
+        finally:
+            bone_names = {}
+
+    def fbx_data_object_elements(root, ob_obj, scene_data):
+        nonlocal bone_names
+        if ob_obj.is_bone:
+            bone_names = get_bone_names(ob_obj.bdata.id_data)
+        try:
+            return orig_object_elements(root, ob_obj, scene_data)
+        finally:
+            bone_names = {}
 
     try:
-        io_scene_fbx.export_fbx_bin.fbx_data_armature_elements = new_armature_elements
-        io_scene_fbx.export_fbx_bin.fbx_data_object_elements = new_object_elements
+        io_scene_fbx.export_fbx_bin.fbx_name_class = fbx_name_class
+        io_scene_fbx.export_fbx_bin.fbx_data_armature_elements = (
+            fbx_data_armature_elements
+        )
+        io_scene_fbx.export_fbx_bin.fbx_data_object_elements = fbx_data_object_elements
         yield
     finally:
+        io_scene_fbx.export_fbx_bin.fbx_name_class = orig_name_class
         io_scene_fbx.export_fbx_bin.fbx_data_armature_elements = orig_armature_elements
         io_scene_fbx.export_fbx_bin.fbx_data_object_elements = orig_object_elements
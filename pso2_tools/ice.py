@@ -2,27 +2,59 @@ import fnmatch
 import itertools
 import struct
 from collections.abc import Iterable, Sequence
-from dataclasses import dataclass
 from pathlib import Path
 
 from . import datafile
 
 
-@dataclass
 class IceDataFile:
+    """
+    A file in an ICE archive. Its contents stay in the .NET array they were
+    extracted to until `data` is first read, so files that are only looked at
+    by name are never copied.
+    """
+
     name: str
-    data: bytes
+
+    def __init__(self, name: str, array: Sequence[int]):
+        self.name = name
+        self._array: Sequence[int] | None = array
+        self._data: bytes | None = None
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            assert self._array is not None
+
+            data = bytes(self._array)
+            header_size = struct.unpack_from("i", data, offset=0xC)[0]
+
+            self._data = data[header_size:]
+            self._array = None
+
+        return self._data
+
+    def to_byte_array(self):
+        if self._array is None:
+            return self.data
+
+        # Copy the contents to a new .NET array without going through Python
+        from System import Array, BitConverter, Byte
+
+        header_size = BitConverter.ToInt32(self._array, 0xC)
+        size = len(self._array) - header_size
+
+        result = Array.CreateInstance(Byte, size)
+        Array.Copy(self._array, header_size, result, 0, size)
+        return result
 
     @classmethod
     def from_byte_array(cls, array: Sequence[int]):
         from Zamboni import IceFile as InternalIceFile
 
         name = InternalIceFile.getFileName(array)
-        data = bytes(array)
-
-        header_size = struct.unpack_from("i", data, offset=0xC)[0]
 
-        return IceDataFile(name=name, data=data[header_size:])
+        return IceDataFile(name=name, array=array)
 
 
 class IceFile:
@@ -1,4 +1,6 @@
-from collections.abc import Iterable
+import os
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -10,6 +12,7 @@ import bpy
 from . import (
     colors,
     datafile,
+    dotnet,
     fbx_wrapper,
     ice,
     material,
@@ -47,6 +50,9 @@ class FbxImportOptions(TypedDict, total=False):
     colors_type: str
 
 
+_FBX_OPTION_KEYS = frozenset(get_type_hints(FbxImportOptions))
+
+
 class ImportOptions(FbxImportOptions, total=False):
     include_tangent_binormal: bool
     colors: dict[str, colors.Color]
@@ -96,7 +102,7 @@ def import_ice_file(
 
     # TODO: if this fails, check the ICE file for an AQP and use guess_aqp_object()
     with closing(objects.ObjectDatabase(context)) as db:
-        if obj := next(db.get_all(file_hash=file_hash), None):
+        if obj := db.find_by_file_hash(file_hash):
             debug_print(
                 f'Found matching hash. Importing with options from "{obj.name}"'
             )
@@ -153,20 +159,35 @@ def _get_import_kwargs(obj: objects.CmxObjectBase):
     }
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelFiles:
     texture_files: list[datafile.DataFile] = field(default_factory=list)
     model_files: list[datafile.DataFile] = field(default_factory=list)
     node_files: list[datafile.DataFile] = field(default_factory=list)
 
+    # File names without extensions, in the same order as the lists above
+    texture_stems: list[str] = field(default_factory=list)
+    model_stems: list[str] = field(default_factory=list)
+    node_stems: list[str] = field(default_factory=list)
+
 
 def collect_model_files(sources: Iterable[datafile.DataFileSource]):
     result = ModelFiles()
 
     for source in sources:
-        result.model_files.extend(source.glob("*.aqp"))
-        result.node_files.extend(source.glob("*.aqn"))
-        result.texture_files.extend(source.glob("*.dds"))
+        for f in source.get_files():
+            # Same case handling as glob()
+            name = os.path.normcase(f.name)
+
+            if name.endswith(".aqp"):
+                result.model_files.append(f)
+                result.model_stems.append(f.name[:-4])
+            elif name.endswith(".aqn"):
+                result.node_files.append(f)
+                result.node_stems.append(f.name[:-4])
+            elif name.endswith(".dds"):
+                result.texture_files.append(f)
+                result.texture_stems.append(f.name[:-4])
 
     return result
 
@@ -186,15 +207,26 @@ def _import_models(
 
     files = collect_model_files(sources)
 
+    if not files.model_files:
+        # Nothing can use the extra textures or build materials without a
+        # model, so just bring in whatever textures there are.
+        _remove_empty_images(import_data_images(files.texture_files))
+
+        if options and (import_colors := options.get("colors")):
+            _set_scene_colors(context, import_colors)
+
+        return {"FINISHED"}
+
+    node_files: dict[str, datafile.DataFile] = {}
+    for stem, f in zip(files.node_stems, files.node_files, strict=True):
+        node_files.setdefault(stem, f)
+
     original_mat_keys = set(bpy.data.materials.keys())
     materials: list[material.Material] = []
 
-    for model in files.model_files:
+    for name, model in zip(files.model_stems, files.model_files, strict=True):
         debug_print("Importing", model.name)
-        name = model.name.removesuffix(".aqp")
-        aqn = next(
-            (f for f in files.node_files if f.name.removesuffix(".aqn") == name), None
-        )
+        aqn = node_files.get(name)
 
         result, new_materials = _import_aqp(
             operator,
@@ -210,54 +242,66 @@ def _import_models(
 
     new_mat_keys = set(bpy.data.materials.keys()).difference(original_mat_keys)
 
+    # The FBX importer makes empty placeholders for textures it can't find
+    _remove_empty_images(_get_material_images(new_mat_keys))
+
+    # Same as find_material() for each key, but without a scan per key
+    materials_by_key: dict[material.MaterialKey, material.Material] = {}
+    for mat in materials:
+        materials_by_key.setdefault(mat.match_key, mat)
+
     model_materials = material.ModelMaterials(
         materials={
             key: mat
             for key in new_mat_keys
-            if (mat := material.find_material(key, materials))
+            if (match_key := material.parse_material_key(key))
+            and (mat := materials_by_key.get(match_key))
         },
-        textures=[import_data_image(tex) for tex in files.texture_files],
+        textures=_remove_empty_images(import_data_images(files.texture_files)),
     )
 
     if options and (import_colors := options.get("colors")):
         _set_scene_colors(context, import_colors)
 
     # Collect extra textures that are not part of the model but are used by it.
+    textures = material.TextureIndex()
+
     if model_materials.has_skin_material:
-        model_materials.skin_textures = material.find_textures("rbd", "sk")
+        model_materials.skin_textures = textures.find("rbd", "sk")
         if not model_materials.skin_textures:
             model_materials.skin_textures = _import_skin_textures(
                 context, high_quality, use_t2_skin
             )
+            textures.add(model_materials.skin_textures)
 
         if not model_materials.has_linked_inner_textures:
-            model_materials.extra_textures.extend(material.find_textures("rbd", "iw"))
+            model_materials.extra_textures.extend(textures.find("rbd", "iw"))
 
     if model_materials.has_eye_material:
-        model_materials.extra_textures.extend(material.find_textures("rey"))
+        model_materials.extra_textures.extend(textures.find("rey"))
 
     if model_materials.has_eyebrow_material:
-        model_materials.extra_textures.extend(material.find_textures("reb"))
+        model_materials.extra_textures.extend(textures.find("reb"))
 
     if model_materials.has_eyelash_material:
-        model_materials.extra_textures.extend(material.find_textures("res"))
+        model_materials.extra_textures.extend(textures.find("res"))
 
     if model_materials.has_classic_default_material:
-        model_materials.extra_textures.extend(material.find_textures("bd", "iw"))
+        model_materials.extra_textures.extend(textures.find("bd", "iw"))
 
     if model_materials.has_decal_texture:
-        model_materials.extra_textures.extend(material.find_textures("bp"))
-
-    _delete_empty_images()
+        model_materials.extra_textures.extend(textures.find("bp"))
 
     debug_print("IMPORT MATERIALS:")
     debug_pprint(model_materials.materials)
 
+    color_map = color_map or colors.ColorMapping()
+
     for key, mat in model_materials.materials.items():
         data = shaders.types.ShaderData(
             material=mat,
             textures=model_materials.get_textures(mat),
-            color_map=color_map or colors.ColorMapping(),
+            color_map=color_map,
             uv_map=uv_map,
         )
         shaders.build_material(context, bpy.data.materials[key], data)
@@ -282,26 +326,125 @@ def _get_ice_path(filename: objects.CmxFileName, data_path: Path, high_quality:
     return None
 
 
-def _delete_empty_images():
-    for image in bpy.data.images.values():
-        if image and image.size[0] == 0 and image.size[1] == 0:  # type: ignore
+def _get_material_images(keys: Iterable[str]):
+    """Get the images used by image texture nodes in the given materials"""
+    images: set[bpy.types.Image] = set()
+
+    for key in keys:
+        node_tree = bpy.data.materials[key].node_tree
+        if node_tree is None:
+            continue
+
+        for node in node_tree.nodes:
+            if isinstance(node, bpy.types.ShaderNodeTexImage) and node.image:
+                images.add(node.image)
+
+    return images
+
+
+def _remove_empty_images(images: Iterable[bpy.types.Image]):
+    """Delete any of the given images that failed to load, and return the rest"""
+    result: list[bpy.types.Image] = []
+
+    for image in images:
+        if image.size[0] == 0 and image.size[1] == 0:  # type: ignore
             bpy.data.images.remove(image)
+        else:
+            result.append(image)
+
+    return result
+
+
+def import_data_images(files: Sequence[datafile.DataFile]) -> list[bpy.types.Image]:
+    """Import textures from data files.
+
+    Images are packed straight from memory where Blender can read them that
+    way. Any others are written to temporary files first. Those writes run on
+    a thread pool, but loading the images has to stay on the main thread.
+    """
+    images = [_import_packed_image(data) for data in files]
+
+    if missing := [i for i, image in enumerate(images) if image is None]:
+        loaded = _import_temp_images([files[i] for i in missing])
+        for i, image in zip(missing, loaded, strict=True):
+            images[i] = image
+
+    return cast("list[bpy.types.Image]", images)
+
+
+def _import_packed_image(data: datafile.DataFile) -> bpy.types.Image | None:
+    image = bpy.data.images.new(data.name, width=1, height=1)
 
+    try:
+        raw = data.data
+        image.pack(data=raw, data_len=len(raw))
+        image.source = "FILE"
+    except (RuntimeError, TypeError):
+        bpy.data.images.remove(image)
+        return None
 
-def import_data_image(data: datafile.DataFile):
+    # Reading the size loads the image. Let the fallback try anything Blender
+    # couldn't decode this way.
+    if image.size[0] == 0 and image.size[1] == 0:  # type: ignore
+        bpy.data.images.remove(image)
+        return None
+
+    _set_image_colorspace(image)
+    return image
+
+
+def _import_temp_images(files: Sequence[datafile.DataFile]):
     with TemporaryDirectory() as tempdir:
-        tempfile = Path(tempdir) / data.name
+        paths = _get_temp_paths(Path(tempdir), files)
 
-        with tempfile.open("wb") as f:
-            f.write(data.data)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # Consume the results so any errors are raised here
+            list(executor.map(_write_temp_file, paths, files))
 
-        return import_image(tempfile)
+        return [import_image(path) for path in paths]
+
+
+def _get_temp_paths(tempdir: Path, files: Iterable[datafile.DataFile]):
+    # Images are named after their file, so keep the name and move files with
+    # a name that is already used into their own directory.
+    names: set[str] = set()
+    paths: list[Path] = []
+
+    for i, data in enumerate(files):
+        if data.name in names:
+            paths.append(tempdir / str(i) / data.name)
+        else:
+            paths.append(tempdir / data.name)
+            names.add(data.name)
+
+    return paths
+
+
+_TEMP_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_temp_file(path: Path, data: datafile.DataFile):
+    path.parent.mkdir(exist_ok=True)
+
+    # Skip the buffered file object. These are written once and closed.
+    fd = os.open(path, _TEMP_FILE_FLAGS, 0o600)
+    try:
+        view = memoryview(data.data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
 
 
 def import_image(path: Path):
     image = bpy.data.images.load(str(path))
     image.pack()
 
+    _set_image_colorspace(image)
+    return image
+
+
+def _set_image_colorspace(image: bpy.types.Image):
     if image.colorspace_settings:
         if material.texture_has_parts(image.name, "d"):
             # Diffuse texture
@@ -312,16 +455,16 @@ def import_image(path: Path):
             image.colorspace_settings.is_data = True
             image.colorspace_settings.name = "Non-Color"  # type: ignore
 
-    return image
-
 
 def _import_aqp(
     operator: bpy.types.Operator,
     context: bpy.types.Context,
-    aqp: Path | datafile.DataFile,
-    aqn: Path | datafile.DataFile | None,
+    aqp: datafile.DataFile,
+    aqn: datafile.DataFile | None,
     options: ImportOptions | None = None,
 ) -> tuple[OperatorResult, list[material.Material]]:
+    dotnet.load()
+
     from AquaModelLibrary.Core.General import FbxExporterNative
     from AquaModelLibrary.Data.PSO2.Aqua import AquaMotion, AquaNode, AquaPackage
     from AquaModelLibrary.Data.Utility import CoordSystem
@@ -330,24 +473,17 @@ def _import_aqp(
 
     options = options or {}
 
-    if isinstance(aqp, Path):
-        aqp_data = aqp.read_bytes()
-        aqp_name = aqp.name
-    else:
-        aqp_data = aqp.data
-        aqp_name = aqp.name
-
-    package = AquaPackage(aqp_data)
+    package = AquaPackage(aqp.to_byte_array())
     model = package.models[0]
 
     # TODO: for linked outerwear, just get the material info from the model
     # but don't import the model.
 
-    if aqn is not None:
-        aqn_data = aqn.read_bytes() if isinstance(aqn, Path) else aqn.data
-        skeleton = AquaNode(aqn_data)
-    else:
-        skeleton = AquaNode.GenerateBasicAQN()
+    skeleton = (
+        AquaNode(aqn.to_byte_array())
+        if aqn is not None
+        else AquaNode.GenerateBasicAQN()
+    )
 
     if model.objc.type > 0xC32:
         model.splitVSETPerMesh()
@@ -360,7 +496,7 @@ def _import_aqp(
     instance_transforms = List[Matrix4x4]()
 
     with TemporaryDirectory() as tempdir:
-        fbxfile = Path(tempdir) / Path(aqp_name).with_suffix(".fbx")
+        fbxfile = Path(tempdir) / Path(aqp.name).with_suffix(".fbx")
 
         FbxExporterNative.ExportToFile(
             aqo=model,
@@ -385,6 +521,7 @@ def _import_aqp(
                 **fbx_options,
             ),
         )
+
         if result != {"FINISHED"}:
             return (result, [])
 
@@ -448,34 +585,25 @@ def _import_skin_textures(
 
     skin_textures = collect_model_files(ice_files).texture_files
 
-    return [import_data_image(tex) for tex in skin_textures]
+    return _remove_empty_images(import_data_images(skin_textures))
 
 
-def _get_uv_map(obj: objects.CmxBodyObject):
-    match (obj.is_ngs, obj.object_type):
-        case True, objects.ObjectType.CAST_ARMS:
-            return material.NGS_CAST_ARMS_UV
-        case True, objects.ObjectType.CAST_BODY:
-            return material.NGS_CAST_BODY_UV
-        case True, objects.ObjectType.CAST_LEGS:
-            return material.NGS_CAST_LEGS_UV
+_UV_MAPS = {
+    (True, objects.ObjectType.CAST_ARMS): material.NGS_CAST_ARMS_UV,
+    (True, objects.ObjectType.CAST_BODY): material.NGS_CAST_BODY_UV,
+    (True, objects.ObjectType.CAST_LEGS): material.NGS_CAST_LEGS_UV,
+    (False, objects.ObjectType.CAST_ARMS): material.CLASSIC_CAST_ARMS_UV,
+    (False, objects.ObjectType.CAST_BODY): material.CLASSIC_CAST_BODY_UV,
+    (False, objects.ObjectType.CAST_LEGS): material.CLASSIC_CAST_LEGS_UV,
+}
 
-        case False, objects.ObjectType.CAST_ARMS:
-            return material.CLASSIC_CAST_ARMS_UV
-        case False, objects.ObjectType.CAST_BODY:
-            return material.CLASSIC_CAST_BODY_UV
-        case False, objects.ObjectType.CAST_LEGS:
-            return material.CLASSIC_CAST_LEGS_UV
 
-        case _:
-            return None
+def _get_uv_map(obj: objects.CmxBodyObject):
+    return _UV_MAPS.get((obj.is_ngs, obj.object_type))
 
 
 def _get_fbx_options(options: ImportOptions):
-    result = FbxImportOptions()
-
-    for key in get_type_hints(FbxImportOptions):
-        if key in options:
-            result[key] = options[key]
-
-    return result
+    return cast(
+        "FbxImportOptions",
+        {key: options[key] for key in _FBX_OPTION_KEYS & options.keys()},
+    )
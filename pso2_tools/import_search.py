@@ -1,13 +1,17 @@
-import math
-import sys
+import fnmatch
+import json
+import os
+import re
 import time
 from collections.abc import Iterable, Sequence
-from contextlib import closing
 from dataclasses import dataclass, fields
+from enum import IntEnum
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Any, cast
+from typing import Any
 
 import bpy
+import numpy as np
 
 from . import ccl, classes, import_model, import_props, objects
 from .colors import COLOR_CHANNELS, Color, ColorId
@@ -20,7 +24,7 @@ from .preferences import (
 from .util import BlenderIcon, OperatorResult
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelMetadata:
     has_linked_inner: bool = False
     has_linked_outer: bool = False
@@ -28,119 +32,139 @@ class ModelMetadata:
 
     @classmethod
     def from_object(cls, obj: objects.CmxObjectBase, data_path: Path):
-        result = cls()
+        if not isinstance(obj, objects.CmxBodyObject):
+            return cls()
 
-        if isinstance(obj, objects.CmxBodyObject):
-            result.leg_length = obj.leg_length
-            result.has_linked_inner = obj.linked_inner_file.exists(data_path)
-            result.has_linked_outer = obj.linked_outer_file.exists(data_path)
+        return cls(
+            has_linked_inner=_file_exists(obj.linked_inner_file.name, data_path),
+            has_linked_outer=_file_exists(obj.linked_outer_file.name, data_path),
+            leg_length=obj.leg_length,
+        )
 
-        return result
 
+@lru_cache(maxsize=128)
+def _file_exists(name: str, data_path: Path):
+    # ModelMetadata is rebuilt on every redraw of the search dialog. Checking
+    # a file can take several stat() calls, so remember the results until the
+    # dialog is closed.
+    return objects.CmxFileName(name).exists(data_path)
+
+
+_GENDERED_OBJECT_TYPES = frozenset(
+    [
+        str(objects.ObjectType.BASEWEAR),
+        str(objects.ObjectType.BODYPAINT),
+        str(objects.ObjectType.CAST_ARMS),
+        str(objects.ObjectType.CAST_BODY),
+        str(objects.ObjectType.CAST_LEGS),
+        str(objects.ObjectType.COSTUME),
+        str(objects.ObjectType.FACE),
+        str(objects.ObjectType.FACE_TEXTURE),
+        str(objects.ObjectType.INNERWEAR),
+        str(objects.ObjectType.OUTERWEAR),
+        str(objects.ObjectType.SKIN),
+    ]
+)
 
-@classes.register
-class FloatItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty(name="Name")
-    value: bpy.props.FloatProperty(name="Value")
+_VERSIONLESS_OBJECT_TYPES = frozenset(
+    [
+        str(objects.ObjectType.STICKER),
+    ]
+)
 
 
-@classes.register
-class IntItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty(name="Name")
-    value: bpy.props.IntProperty(name="Value")
+_OBJECT_TYPE_ENUM_ITEMS = (
+    (str(objects.ObjectType.ACCESSORY), "Accessory", "Accessory"),
+    (str(objects.ObjectType.BASEWEAR), "Basewear", "Basewear"),
+    (str(objects.ObjectType.BODYPAINT), "Bodypaint", "Bodypaint"),
+    (str(objects.ObjectType.CAST_ARMS), "Cast Arms", "Cast Arms"),
+    (str(objects.ObjectType.CAST_BODY), "Cast Body", "Cast Body"),
+    (str(objects.ObjectType.CAST_LEGS), "Cast Legs", "Cast Legs"),
+    (str(objects.ObjectType.COSTUME), "Costume", "Costume"),
+    (str(objects.ObjectType.EAR), "Ears", "Ears"),
+    (str(objects.ObjectType.EYE), "Eyes", "Eyes"),
+    (str(objects.ObjectType.EYEBROW), "Eyebrows", "Eyebrows"),
+    (str(objects.ObjectType.EYELASH), "Eyelashes", "Eyelashes"),
+    (str(objects.ObjectType.FACE), "Face", "Face"),
+    (str(objects.ObjectType.FACE_TEXTURE), "Face Texture", "Face texture"),
+    (str(objects.ObjectType.FACEPAINT), "Facepaint", "Facepaint"),
+    (str(objects.ObjectType.HAIR), "Hair", "Hair"),
+    (str(objects.ObjectType.HORN), "Horns", "Horns"),
+    (str(objects.ObjectType.INNERWEAR), "Innerwear", "Innerwear"),
+    (str(objects.ObjectType.OUTERWEAR), "Outerwear", "Outerwear"),
+    (str(objects.ObjectType.SKIN), "Skin", "Skin"),
+    (str(objects.ObjectType.STICKER), "Sticker", "Sticker"),
+    (str(objects.ObjectType.TEETH), "Teeth", "Teeth"),
+)
 
-    INVALID = sys.maxsize
 
+class _FieldKind(IntEnum):
+    FLOAT = 0
+    INT = 1
+    STRING = 2
+    FILE_NAME = 3
+    COLOR_MAP = 4
 
-@classes.register
-class StringItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty(name="Name")
-    value: bpy.props.StringProperty(name="Value")
 
+# Fields that ListItem stores as its own properties
+_ITEM_FIELDS = frozenset(("object_type", "id", "adjusted_id", "name_en", "name_jp"))
 
-@classes.register
-class FileNameItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty(name="Name")
-    value: bpy.props.StringProperty(name="File Name")
 
-    def to_file_name(self):
-        return objects.CmxFileName(self.value)
+@cache
+def _get_field_table(
+    cls: type[objects.CmxObjectBase],
+) -> tuple[tuple[str, _FieldKind], ...]:
+    """Get the name and kind of each extra field ListItem needs to store for a class"""
+    result = []
 
+    for field in fields(cls):
+        if field.name in _ITEM_FIELDS:
+            continue
 
-@classes.register
-class ColorMapItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty(name="Name")
-    red: bpy.props.IntProperty(name="Red Channel")
-    green: bpy.props.IntProperty(name="Green Channel")
-    blue: bpy.props.IntProperty(name="Blue Channel")
-    alpha: bpy.props.IntProperty(name="Alpha Channel")
-
-    def to_color_map(self):
-        return objects.CmxColorMapping(
-            red=ColorId(self.red),
-            green=ColorId(self.green),
-            blue=ColorId(self.blue),
-            alpha=ColorId(self.alpha),
-        )
+        if field.type in (float, float | None):
+            kind = _FieldKind.FLOAT
+        elif field.type in (int, int | None):
+            kind = _FieldKind.INT
+        elif field.type is str:
+            kind = _FieldKind.STRING
+        elif field.type == objects.CmxFileName:
+            kind = _FieldKind.FILE_NAME
+        elif field.type == objects.CmxColorMapping:
+            kind = _FieldKind.COLOR_MAP
+        else:
+            raise NotImplementedError(f"Unhandled field type {field.type}")
+
+        result.append((field.name, kind))
 
+    return tuple(result)
 
-_GENDERED_OBJECT_TYPES = [
-    str(objects.ObjectType.BASEWEAR),
-    str(objects.ObjectType.BODYPAINT),
-    str(objects.ObjectType.CAST_ARMS),
-    str(objects.ObjectType.CAST_BODY),
-    str(objects.ObjectType.CAST_LEGS),
-    str(objects.ObjectType.COSTUME),
-    str(objects.ObjectType.FACE),
-    str(objects.ObjectType.FACE_TEXTURE),
-    str(objects.ObjectType.INNERWEAR),
-    str(objects.ObjectType.OUTERWEAR),
-    str(objects.ObjectType.SKIN),
-]
 
-_VERSIONLESS_OBJECT_TYPES = [
-    str(objects.ObjectType.STICKER),
-]
+@cache
+def _get_converted_fields(
+    cls: type[objects.CmxObjectBase],
+) -> tuple[tuple[str, _FieldKind], ...]:
+    """Get the fields that aren't stored in ListItem.fields_json as-is"""
+    return tuple(
+        (name, kind)
+        for name, kind in _get_field_table(cls)
+        if kind in (_FieldKind.FILE_NAME, _FieldKind.COLOR_MAP)
+    )
 
 
 @classes.register
 class ListItem(bpy.types.PropertyGroup):
     object_type: bpy.props.EnumProperty(
         name="Type",
-        items=[
-            (str(objects.ObjectType.ACCESSORY), "Accessory", "Accessory"),
-            (str(objects.ObjectType.BASEWEAR), "Basewear", "Basewear"),
-            (str(objects.ObjectType.BODYPAINT), "Bodypaint", "Bodypaint"),
-            (str(objects.ObjectType.CAST_ARMS), "Cast Arms", "Cast Arms"),
-            (str(objects.ObjectType.CAST_BODY), "Cast Body", "Cast Body"),
-            (str(objects.ObjectType.CAST_LEGS), "Cast Legs", "Cast Legs"),
-            (str(objects.ObjectType.COSTUME), "Costume", "Costume"),
-            (str(objects.ObjectType.EAR), "Ears", "Ears"),
-            (str(objects.ObjectType.EYE), "Eyes", "Eyes"),
-            (str(objects.ObjectType.EYEBROW), "Eyebrows", "Eyebrows"),
-            (str(objects.ObjectType.EYELASH), "Eyelashes", "Eyelashes"),
-            (str(objects.ObjectType.FACE), "Face", "Face"),
-            (str(objects.ObjectType.FACE_TEXTURE), "Face Texture", "Face texture"),
-            (str(objects.ObjectType.FACEPAINT), "Facepaint", "Facepaint"),
-            (str(objects.ObjectType.HAIR), "Hair", "Hair"),
-            (str(objects.ObjectType.HORN), "Horns", "Horns"),
-            (str(objects.ObjectType.INNERWEAR), "Innerwear", "Innerwear"),
-            (str(objects.ObjectType.OUTERWEAR), "Outerwear", "Outerwear"),
-            (str(objects.ObjectType.SKIN), "Skin", "Skin"),
-            (str(objects.ObjectType.STICKER), "Sticker", "Sticker"),
-            (str(objects.ObjectType.TEETH), "Teeth", "Teeth"),
-        ],
+        items=_OBJECT_TYPE_ENUM_ITEMS,
     )
     name_en: bpy.props.StringProperty(name="English Name")
     name_jp: bpy.props.StringProperty(name="Japanese Name")
     object_id: bpy.props.IntProperty(name="ID")
     adjusted_id: bpy.props.IntProperty(name="Adjusted ID")
 
-    files: bpy.props.CollectionProperty(type=FileNameItem)
-    float_fields: bpy.props.CollectionProperty(type=FloatItem)
-    int_fields: bpy.props.CollectionProperty(type=IntItem)
-    string_fields: bpy.props.CollectionProperty(type=StringItem)
-    color_map_fields: bpy.props.CollectionProperty(type=ColorMapItem)
+    # JSON object holding every other field of the object. A single string is
+    # much cheaper to create than a collection item per field.
+    fields_json: bpy.props.StringProperty(name="Fields")
 
     # Extra metadata for sort
     leg_length: bpy.props.FloatProperty(name="Leg Length")
@@ -174,121 +198,91 @@ class ListItem(bpy.types.PropertyGroup):
         else:
             self.leg_length = 0
 
-        for field in fields(obj):
-            if field.name in ("object_type", "id", "adjusted_id", "name_en", "name_jp"):
-                continue
-
-            name = field.name
-            value = getattr(obj, name)
-
-            if field.type in (float, float | None):
-                prop = cast("FloatItem", self.float_fields.add())
-                prop.name = name
-                prop.value = math.nan if value is None else value
-
-            elif field.type in (int, int | None):
-                prop = cast("IntItem", self.float_fields.add())
-                prop.name = name
-                prop.value = IntItem.INVALID if value is None else value
-
-            elif field.type is str:
-                prop = cast("StringItem", self.string_fields.add())
-                prop.name = name
-                prop.value = value
-
-            elif field.type == objects.CmxFileName:
-                prop = cast("FileNameItem", self.files.add())
-                prop.name = name
-                prop.value = value.name
-
-            elif field.type == objects.CmxColorMapping:
-                prop = cast("ColorMapItem", self.color_map_fields.add())
-                prop.name = name
-                prop.red = int(value.red)
-                prop.green = int(value.green)
-                prop.blue = int(value.blue)
-                prop.alpha = int(value.alpha)
-
-            else:
-                raise NotImplementedError(f"Unhandled field type {field.type}")
+        self.fields_json = json.dumps(
+            {
+                name: _encode_field(kind, getattr(obj, name))
+                for name, kind in _get_field_table(type(obj))
+            }
+        )
 
     def to_object(self):
         object_type = objects.ObjectType(self.object_type)
         cls = _get_object_class(object_type)
-        obj = cls(
+
+        # Most fields are stored as-is, so only the rest need converting
+        data = json.loads(self.fields_json)
+        for name, kind in _get_converted_fields(cls):
+            data[name] = _decode_field(kind, data[name])
+
+        return cls(
             object_type=object_type,
             id=self.object_id,
             adjusted_id=self.adjusted_id,
             name_en=self.name_en,
             name_jp=self.name_jp,
+            **data,
         )
 
-        for file_item in self.files:
-            setattr(obj, file_item.name, file_item.to_file_name())
+    def get_file_name(self, name: str):
+        return objects.CmxFileName(json.loads(self.fields_json).get(name, ""))
 
-        for float_item in self.float_fields:
-            setattr(
-                obj,
-                float_item.name,
-                None if math.isnan(float_item.value) else float_item.value,
-            )
 
-        for int_item in self.int_fields:
-            setattr(
-                obj,
-                int_item.name,
-                None if int_item.value == IntItem.INVALID else int_item.value,
-            )
+def _encode_field(kind: _FieldKind, value: Any):
+    if kind == _FieldKind.FILE_NAME:
+        return value.name
 
-        for str_item in self.string_fields:
-            setattr(obj, str_item.name, str_item.value)
+    if kind == _FieldKind.COLOR_MAP:
+        return [int(value.red), int(value.green), int(value.blue), int(value.alpha)]
 
-        for color_item in self.color_map_fields:
-            setattr(obj, color_item.name, color_item.to_color_map())
+    return value
 
-        return obj
+
+def _decode_field(kind: _FieldKind, value: Any):
+    if kind == _FieldKind.FILE_NAME:
+        return objects.CmxFileName(value)
+
+    if kind == _FieldKind.COLOR_MAP:
+        red, green, blue, alpha = value
+        return objects.CmxColorMapping(
+            red=ColorId(red),
+            green=ColorId(green),
+            blue=ColorId(blue),
+            alpha=ColorId(alpha),
+        )
+
+    return value
+
+
+_OBJECT_CLASSES: dict[objects.ObjectType, type[objects.CmxObjectBase]] = {
+    objects.ObjectType.ACCESSORY: objects.CmxAccessory,
+    objects.ObjectType.BASEWEAR: objects.CmxBodyObject,
+    objects.ObjectType.COSTUME: objects.CmxBodyObject,
+    objects.ObjectType.OUTERWEAR: objects.CmxBodyObject,
+    objects.ObjectType.CAST_ARMS: objects.CmxBodyObject,
+    objects.ObjectType.CAST_BODY: objects.CmxBodyObject,
+    objects.ObjectType.CAST_LEGS: objects.CmxBodyObject,
+    objects.ObjectType.BODYPAINT: objects.CmxBodyPaint,
+    objects.ObjectType.INNERWEAR: objects.CmxBodyPaint,
+    objects.ObjectType.EAR: objects.CmxEarObject,
+    objects.ObjectType.EYE: objects.CmxEyeObject,
+    objects.ObjectType.EYEBROW: objects.CmxEyebrowObject,
+    objects.ObjectType.EYELASH: objects.CmxEyebrowObject,
+    objects.ObjectType.FACE: objects.CmxFaceObject,
+    objects.ObjectType.FACE_TEXTURE: objects.CmxFacePaint,
+    objects.ObjectType.FACEPAINT: objects.CmxFacePaint,
+    objects.ObjectType.HAIR: objects.CmxHairObject,
+    objects.ObjectType.HORN: objects.CmxHornObject,
+    objects.ObjectType.SKIN: objects.CmxSkinObject,
+    objects.ObjectType.STICKER: objects.CmxSticker,
+    objects.ObjectType.TEETH: objects.CmxTeethObject,
+}
 
 
 def _get_object_class(object_type: objects.ObjectType) -> type[objects.CmxObjectBase]:
-    match object_type:
-        case objects.ObjectType.ACCESSORY:
-            return objects.CmxAccessory
-        case (
-            objects.ObjectType.BASEWEAR
-            | objects.ObjectType.COSTUME
-            | objects.ObjectType.OUTERWEAR
-        ):
-            return objects.CmxBodyObject
-        case (
-            objects.ObjectType.CAST_ARMS
-            | objects.ObjectType.CAST_BODY
-            | objects.ObjectType.CAST_LEGS
-        ):
-            return objects.CmxBodyObject
-        case objects.ObjectType.BODYPAINT | objects.ObjectType.INNERWEAR:
-            return objects.CmxBodyPaint
-        case objects.ObjectType.EAR:
-            return objects.CmxEarObject
-        case objects.ObjectType.EYE:
-            return objects.CmxEyeObject
-        case objects.ObjectType.EYEBROW | objects.ObjectType.EYELASH:
-            return objects.CmxEyebrowObject
-        case objects.ObjectType.FACE:
-            return objects.CmxFaceObject
-        case objects.ObjectType.FACE_TEXTURE | objects.ObjectType.FACEPAINT:
-            return objects.CmxFacePaint
-        case objects.ObjectType.HAIR:
-            return objects.CmxHairObject
-        case objects.ObjectType.HORN:
-            return objects.CmxHornObject
-        case objects.ObjectType.SKIN:
-            return objects.CmxSkinObject
-        case objects.ObjectType.STICKER:
-            return objects.CmxSticker
-        case objects.ObjectType.TEETH:
-            return objects.CmxTeethObject
-        case _:
-            raise NotImplementedError(f"Unhandled item type {object_type}")
+    try:
+        return _OBJECT_CLASSES[object_type]
+    except KeyError:
+        raise NotImplementedError(f"Unhandled item type {object_type}") from None
 
 
 @classes.register
@@ -306,6 +300,14 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
     _color_set_item_cache: ListItem | None = None
     _color_set_enum_cache: list[tuple[str, str, str, int]] = []
 
+    # The data path is needed on every redraw, but it can't change while the
+    # dialog is open, so only read it from the preferences once.
+    _data_path_cache: Path | None = None
+
+    # draw() needs the selected object on every redraw. Keep it until the
+    # selection changes so it isn't rebuilt from the list item each time.
+    _selected_object_cache: tuple[ListItem, objects.CmxObjectBase] | None = None
+
     def _get_selected_model_files(
         self,
         context: bpy.types.Context | None,
@@ -315,8 +317,7 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
         except IndexError:
             return []
 
-        data_path = get_preferences(context).get_pso2_data_path()
-        return _get_file_items(selected.files, data_path)
+        return _get_file_items(selected, self._get_data_path(context))
 
     def _get_selected_model_colors(
         self,
@@ -385,17 +386,23 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
     color_set_channel_2: bpy.props.StringProperty()
 
     def _handle_database_update(self, context: bpy.types.Context):
+        PSO2_OT_ModelSearch._selected_object_cache = None
         _populate_model_list(self.models, context)
 
     handle_database_update: bpy.props.BoolProperty(update=_handle_database_update)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        _acquire_db()
         _populate_model_list(self.models, bpy.context)
 
     def __del__(self):
         PSO2_OT_ModelSearch._color_set_item_cache = None
         PSO2_OT_ModelSearch._color_set_enum_cache = []
+        PSO2_OT_ModelSearch._data_path_cache = None
+        PSO2_OT_ModelSearch._selected_object_cache = None
+        _file_exists.cache_clear()
+        _release_db()
 
     def draw(self, context):
         assert self.layout is not None
@@ -421,8 +428,8 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
         col.use_property_split = True
         col.use_property_decorate = False
 
-        if obj := self.get_selected_object():
-            meta = ModelMetadata.from_object(obj, preferences.get_pso2_data_path())
+        if obj := self._get_drawn_object():
+            meta = ModelMetadata.from_object(obj, self._get_data_path(context))
 
             row = col.row()
             row.use_property_split = False
@@ -430,7 +437,7 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
             col.separator()
 
             # Colors
-            if colors := sorted(obj.get_colors()):
+            if colors := obj.sorted_colors:
                 col.label(text="Colors", icon="COLOR")
 
                 if _object_has_color_sets(obj, context):
@@ -443,9 +450,11 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
                 flow = col.grid_flow(columns=2, row_major=True)
                 flow.use_property_split = False
 
+                color_set_channels = self._get_color_set_channels()
+
                 for color in colors:
                     color_data, color_prop, color_enabled = self._get_color_prop(
-                        context, color, preferences
+                        context, color, preferences, color_set_channels
                     )
 
                     color_row = flow.row()
@@ -497,9 +506,35 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
             self, width=840, confirm_text="Import"
         )
 
+    def _get_data_path(self, context: bpy.types.Context | None):
+        if PSO2_OT_ModelSearch._data_path_cache is None:
+            PSO2_OT_ModelSearch._data_path_cache = get_preferences(
+                context
+            ).get_pso2_data_path()
+
+        return PSO2_OT_ModelSearch._data_path_cache
+
     def get_selected_object(self):
         return _get_selected_object(self)
 
+    def _get_drawn_object(self):
+        if self.models_index < 0:
+            return None
+
+        try:
+            selected: ListItem = self.models[self.models_index]
+        except IndexError:
+            return None
+
+        cache = PSO2_OT_ModelSearch._selected_object_cache
+        if cache is not None and cache[0] == selected:
+            return cache[1]
+
+        obj = selected.to_object()
+        PSO2_OT_ModelSearch._selected_object_cache = (selected, obj)
+
+        return obj
+
     def get_object_options(self, obj: objects.CmxObjectBase):
         options = super().get_options(
             ignore=(
@@ -522,26 +557,32 @@ class PSO2_OT_ModelSearch(bpy.types.Operator, import_props.CommonImportProps):
 
     def _get_color_set_dict(self, obj: objects.CmxObjectBase) -> dict[str, Color]:
         result = {}
+        color_set_channels = self._get_color_set_channels()
 
         for color in obj.get_colors():
             channel = COLOR_CHANNELS[color]
 
-            if channel.prop in (self.color_set_channel_1, self.color_set_channel_2):
+            if channel.prop in color_set_channels:
                 result[channel.custom_property_name] = getattr(self, channel.prop)
 
         return result
 
+    def _get_color_set_channels(self) -> tuple[str, str]:
+        """Get the color properties controlled by the selected color set"""
+        return (self.color_set_channel_1, self.color_set_channel_2)
+
     def _get_color_prop(
         self,
         context: bpy.types.Context,
         color: ColorId,
         preferences: Pso2ToolsPreferences,
+        color_set_channels: tuple[str, str],
     ) -> tuple[Any, str, bool]:
         """Get (data, prop, enabled) for a color channel"""
         channel = COLOR_CHANNELS[color]
 
         # If this object has a color set, use the selected color set's colors (read-only)
-        if channel.prop in (self.color_set_channel_1, self.color_set_channel_2):
+        if channel.prop in color_set_channels:
             return self, channel.prop, False
 
         # If we've imported a model before, use the scene properties
@@ -562,12 +603,11 @@ def _get_selected_object(self: PSO2_OT_ModelSearch) -> objects.CmxObjectBase | N
         return None
 
 
-def _get_file_items(items: Iterable[FileNameItem], data_path: Path):
-    item = next((item for item in items if item.name == "file"), None)
-    if item is None:
+def _get_file_items(item: ListItem, data_path: Path):
+    normal = item.get_file_name("file")
+    if not normal:
         return
 
-    normal = item.to_file_name()
     high = normal.ex
 
     if high.exists(data_path):
@@ -578,8 +618,24 @@ def _get_file_items(items: Iterable[FileNameItem], data_path: Path):
 
 
 def _get_color_sets(item: ListItem, context: bpy.types.Context):
-    with closing(objects.ObjectDatabase(context)) as db:
-        return db.get_color_sets(item.object_type, item.adjusted_id)
+    return _get_cached_color_sets(
+        _get_db(context),
+        objects.ObjectType(item.object_type),
+        item.adjusted_id,
+        objects.ObjectDatabase.generation,
+    )
+
+
+@lru_cache(maxsize=512)
+def _get_cached_color_sets(
+    db: objects.ObjectDatabase,
+    object_type: objects.ObjectType,
+    adjusted_id: int,
+    generation: int,
+):
+    # The dialog asks for the same color sets on every redraw. generation is
+    # only part of the key so results from an older database are not reused.
+    return db.get_color_sets(object_type, adjusted_id)
 
 
 def _color_set_enum_tuple(index: int, name: str) -> tuple[str, str, str, int]:
@@ -605,53 +661,148 @@ def _get_selected_color_set(item: ListItem, index: int, context: bpy.types.Conte
 
 
 def _object_has_color_sets(obj: objects.CmxObjectBase, context: bpy.types.Context):
-    with closing(objects.ObjectDatabase(context)) as db:
-        result = db.get_color_sets(obj.object_type, obj.adjusted_id)
-        return bool(result.sets)
+    result = _get_cached_color_sets(
+        _get_db(context),
+        obj.object_type,
+        obj.adjusted_id,
+        objects.ObjectDatabase.generation,
+    )
+    return bool(result.sets)
+
+
+# The search dialog queries the database many times while it is open, so it
+# shares one connection until the last dialog is closed.
+_db: objects.ObjectDatabase | None = None
+_db_owners = 0
+
+
+def _get_db(context: bpy.types.Context):
+    global _db
+    if _db is None:
+        _db = objects.ObjectDatabase(context)
+
+    return _db
+
+
+def _acquire_db():
+    global _db_owners
+    _db_owners += 1
+
+
+def _release_db():
+    global _db_owners
+    _db_owners = max(_db_owners - 1, 0)
+    if not _db_owners:
+        _close_db()
+
+
+def _close_db():
+    global _db
+    if _db is not None:
+        _db.close()
+        _db = None
+
+    # Cached results hold on to the connection they were read from
+    _get_cached_color_sets.cache_clear()
 
 
 def _populate_model_list(collection, context: bpy.types.Context):
     start = time.monotonic()
 
     collection.clear()
+    PSO2_UL_ModelList._items_cache = None
+    PSO2_OT_ModelSearch._selected_object_cache = None
 
-    with closing(objects.ObjectDatabase(context)) as db:
-        for obj in db.get_all():
-            item: ListItem = collection.add()
-            item.populate(obj)
+    all_objects = list(_get_db(context).get_all())
 
-    end = time.monotonic()
-    debug_print(f"PSO2 items loaded in {end - start:0.1f}s")
+    read = time.monotonic()
 
+    add_item = collection.add
+    for obj in all_objects:
+        item: ListItem = add_item()
+        item.populate(obj)
 
-def _false(item):
-    return False
+    # Don't leave the connection open if no dialog is going to use it
+    if not _db_owners:
+        _close_db()
+
+    end = time.monotonic()
+    debug_print(
+        f"PSO2 items loaded in {end - start:0.1f}s "
+        f"(database {read - start:0.1f}s, list {end - read:0.1f}s)"
+    )
 
 
 def _is_ngs(item: ListItem):
     if item.object_type in _VERSIONLESS_OBJECT_TYPES:
         return False
 
-    return objects.is_ngs(item.object_id)
+    return item.object_id >= objects.NGS_START
 
 
-def _is_classic(item: ListItem):
-    if item.object_type in _VERSIONLESS_OBJECT_TYPES:
-        return False
+@dataclass(slots=True)
+class _ItemArrays:
+    """The list item properties used to filter and sort, one array per property"""
+
+    ids: np.ndarray
+    object_types: np.ndarray
+    names: list[str]
+    sort_names: np.ndarray
+    leg_lengths: np.ndarray
+
+    @classmethod
+    def from_items(cls, items: Sequence[ListItem]):
+        ids = np.empty(len(items), dtype=np.int32)
+        items.foreach_get("object_id", ids)  # type: ignore
+
+        leg_lengths = np.empty(len(items), dtype=np.float32)
+        items.foreach_get("leg_length", leg_lengths)  # type: ignore
+
+        return cls(
+            ids=ids,
+            object_types=np.array([item.object_type for item in items], dtype=str),
+            names=[item.item_name for item in items],
+            sort_names=np.array([item.sort_name for item in items], dtype=str),
+            leg_lengths=leg_lengths,
+        )
+
+
+_BODY_TYPE_NONE = 0
+_BODY_TYPE_T1 = 1
+_BODY_TYPE_T2 = 2
 
-    return not objects.is_ngs(item.object_id)
 
+def _get_body_type(object_id: int):
+    if objects.is_t1(object_id):
+        return _BODY_TYPE_T1
 
-def _is_t1(item: ListItem):
-    return objects.is_t1(item.object_id)
+    if objects.is_t2(object_id):
+        return _BODY_TYPE_T2
 
+    return _BODY_TYPE_NONE
 
-def _is_t2(item: ListItem):
-    return objects.is_t2(item.object_id)
 
+@cache
+def _get_body_type_table():
+    """Get the start of each ID range and the body type of the IDs in it"""
+    bounds = sorted({x for r in objects.T1_ID_RANGES + objects.T2_ID_RANGES for x in r})
+    body_types = [_get_body_type(x) for x in bounds]
 
-def _is_genderless(item: ListItem):
-    return objects.is_genderless(item.object_id)
+    # IDs below the first bound get index 0 from searchsorted()
+    return np.array(bounds), np.array([_BODY_TYPE_NONE, *body_types], dtype=np.int8)
+
+
+def _get_body_types(ids: np.ndarray):
+    bounds, body_types = _get_body_type_table()
+    return body_types[np.searchsorted(bounds, ids, side="right")]
+
+
+def _get_new_order(order: np.ndarray) -> list[int]:
+    """Convert sorted indices to the new position of each item, like sort_items_helper()"""
+    result = np.empty_like(order)
+    result[order] = np.arange(len(order))
+
+    return result.tolist()
 
 
 @classes.register
@@ -661,6 +812,10 @@ class PSO2_UL_ModelList(bpy.types.UIList):
     bl_idname = "PSO2_UL_ModelList"
     layout_type = "DEFAULT"
 
+    # filter_items() runs on every redraw, but the list only changes when it is
+    # repopulated, so keep the item arrays until then.
+    _items_cache: tuple[tuple[int, str, int], _ItemArrays] | None = None
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.use_filter_show = True
@@ -672,94 +827,90 @@ class PSO2_UL_ModelList(bpy.types.UIList):
         preferences = get_preferences(context)
         items: Sequence[ListItem] = getattr(data, property)
 
+        arrays = self._get_item_arrays(data, property, items)
+        ids = arrays.ids
+        object_types = arrays.object_types
+
         if self.filter_name:
-            # https://github.com/nutti/fake-bpy-module/issues/376
-            flt_flags = cast(
-                "list[int]",
-                bpy.types.UI_UL_list.filter_items_by_name(
-                    self.filter_name,
-                    self.bitflag_filter_item,
-                    items,
-                    propname="item_name",
-                ),
-            )
+            # Same matching as UI_UL_list.filter_items_by_name(), but with the
+            # pattern compiled once instead of going through fnmatch per item.
+            # fnmatch.fnmatch() normalizes case the way the platform does, so
+            # this only ignores case on Windows, like the original.
+            normcase = os.path.normcase
+            pattern = re.compile(fnmatch.translate(normcase(f"*{self.filter_name}*")))
+            flt_flags = [
+                self.bitflag_filter_item
+                if name and pattern.match(normcase(name))
+                else 0
+                for name in arrays.names
+            ]
         else:
             flt_flags = [self.bitflag_filter_item] * len(items)
 
-        def hide_item(idx):
-            flt_flags[idx] &= ~self.bitflag_filter_item
+        hide = np.zeros(len(items), dtype=bool)
 
         if preferences.model_search_versions:
-            should_hide_ngs = (
-                _is_ngs if "NGS" not in preferences.model_search_versions else _false
-            )
-            should_hide_classic = (
-                _is_classic
-                if "CLASSIC" not in preferences.model_search_versions
-                else _false
-            )
+            versioned = ~np.isin(object_types, list(_VERSIONLESS_OBJECT_TYPES))
+            ngs = ids >= objects.NGS_START
+
+            if "NGS" not in preferences.model_search_versions:
+                hide |= versioned & ngs
 
-            for idx, item in enumerate(items):
-                if should_hide_ngs(item) or should_hide_classic(item):
-                    hide_item(idx)
+            if "CLASSIC" not in preferences.model_search_versions:
+                hide |= versioned & ~ngs
 
         if preferences.model_search_body_types:
-            should_hide_t1 = (
-                _is_t1 if "T1" not in preferences.model_search_body_types else _false
-            )
-            should_hide_t2 = (
-                _is_t2 if "T2" not in preferences.model_search_body_types else _false
-            )
-            should_hide_genderless = (
-                _is_genderless
-                if "NONE" not in preferences.model_search_body_types
-                else _false
-            )
+            gendered = np.isin(object_types, list(_GENDERED_OBJECT_TYPES))
+            body_types = _get_body_types(ids)
 
-            for idx, item in enumerate(items):
-                if item.object_type not in _GENDERED_OBJECT_TYPES:
-                    continue
+            if "T1" not in preferences.model_search_body_types:
+                hide |= gendered & (body_types == _BODY_TYPE_T1)
 
-                if (
-                    should_hide_t1(item)
-                    or should_hide_t2(item)
-                    or should_hide_genderless(item)
-                ):
-                    hide_item(idx)
+            if "T2" not in preferences.model_search_body_types:
+                hide |= gendered & (body_types == _BODY_TYPE_T2)
+
+            if "NONE" not in preferences.model_search_body_types:
+                hide |= gendered & (body_types == _BODY_TYPE_NONE)
 
         if preferences.model_search_categories:
-            show_types = {
+            show_types = [
                 x.strip()
                 for enum in preferences.model_search_categories
                 for x in enum.split("|")
-            }
-            for idx, item in enumerate(items):
-                if str(item.object_type) not in show_types:
-                    hide_item(idx)
+            ]
+            hide |= ~np.isin(object_types, show_types)
+
+        if hide.any():
+            flags = np.array(flt_flags, dtype=np.int32)
+            flags[hide] &= ~self.bitflag_filter_item
+            flt_flags = flags.tolist()
 
         match preferences.model_search_sort:
             case "ALPHA":
-                flt_neworder = bpy.types.UI_UL_list.sort_items_by_name(
-                    items, "sort_name"
+                # Same order as UI_UL_list.sort_items_by_name()
+                flt_neworder = _get_new_order(
+                    np.argsort(np.char.lower(arrays.sort_names), kind="stable")
                 )
 
             case "LEG_LENGTH":
-                _sort = [
-                    (idx, (item.leg_length, item.sort_name))
-                    for idx, item in enumerate(items)
-                ]
-                flt_neworder = bpy.types.UI_UL_list.sort_items_helper(
-                    _sort, lambda e: e[1]
+                flt_neworder = _get_new_order(
+                    np.lexsort((arrays.sort_names, arrays.leg_lengths))
                 )
 
             case _:
-                _sort = [(idx, item.object_id) for idx, item in enumerate(items)]
-                flt_neworder = bpy.types.UI_UL_list.sort_items_helper(
-                    _sort, lambda e: e[1]
-                )
+                flt_neworder = _get_new_order(np.argsort(ids, kind="stable"))
 
         return flt_flags, flt_neworder
 
+    @classmethod
+    def _get_item_arrays(cls, data, property: str, items: Sequence[ListItem]):  # noqa: A002
+        key = (data.as_pointer(), property, len(items))
+
+        if cls._items_cache is None or cls._items_cache[0] != key:
+            cls._items_cache = (key, _ItemArrays.from_items(items))
+
+        return cls._items_cache[1]
+
     def draw_filter(self, context, layout):
         if layout is None:
             raise TypeError()
@@ -824,46 +975,36 @@ class PSO2_UL_ModelList(bpy.types.UIList):
             pass
 
 
+_ICONS: dict[objects.ObjectType, BlenderIcon] = {
+    objects.ObjectType.ACCESSORY: "MESH_TORUS",
+    objects.ObjectType.BASEWEAR: "MATCLOTH",
+    objects.ObjectType.COSTUME: "MATCLOTH",
+    objects.ObjectType.OUTERWEAR: "MATCLOTH",
+    objects.ObjectType.CAST_ARMS: "MATCLOTH",
+    objects.ObjectType.CAST_BODY: "MATCLOTH",
+    objects.ObjectType.CAST_LEGS: "MATCLOTH",
+    objects.ObjectType.BODYPAINT: "TEXTURE",
+    objects.ObjectType.INNERWEAR: "TEXTURE",
+    objects.ObjectType.EAR: "USER",
+    objects.ObjectType.EYE: "HIDE_OFF",
+    objects.ObjectType.EYEBROW: "HIDE_OFF",
+    objects.ObjectType.EYELASH: "HIDE_OFF",
+    objects.ObjectType.FACE: "USER",
+    objects.ObjectType.FACE_TEXTURE: "USER",
+    objects.ObjectType.FACEPAINT: "USER",
+    objects.ObjectType.HAIR: "USER",
+    objects.ObjectType.HORN: "USER",
+    objects.ObjectType.SKIN: "TEXTURE",
+    objects.ObjectType.STICKER: "TEXTURE",
+    objects.ObjectType.TEETH: "USER",
+}
+
+
 def _get_icon(object_type: objects.ObjectType) -> BlenderIcon:
-    match object_type:
-        case objects.ObjectType.ACCESSORY:
-            return "MESH_TORUS"
-        case (
-            objects.ObjectType.BASEWEAR
-            | objects.ObjectType.COSTUME
-            | objects.ObjectType.OUTERWEAR
-        ):
-            return "MATCLOTH"
-        case (
-            objects.ObjectType.CAST_ARMS
-            | objects.ObjectType.CAST_BODY
-            | objects.ObjectType.CAST_LEGS
-        ):
-            return "MATCLOTH"
-        case objects.ObjectType.BODYPAINT | objects.ObjectType.INNERWEAR:
-            return "TEXTURE"
-        case objects.ObjectType.EAR:
-            return "USER"
-        case objects.ObjectType.EYE:
-            return "HIDE_OFF"
-        case objects.ObjectType.EYEBROW | objects.ObjectType.EYELASH:
-            return "HIDE_OFF"
-        case objects.ObjectType.FACE:
-            return "USER"
-        case objects.ObjectType.FACE_TEXTURE | objects.ObjectType.FACEPAINT:
-            return "USER"
-        case objects.ObjectType.HAIR:
-            return "USER"
-        case objects.ObjectType.HORN:
-            return "USER"
-        case objects.ObjectType.SKIN:
-            return "TEXTURE"
-        case objects.ObjectType.STICKER:
-            return "TEXTURE"
-        case objects.ObjectType.TEETH:
-            return "USER"
-        case _:
-            raise NotImplementedError(f"Unhandled item type {object_type}")
+    try:
+        return _ICONS[object_type]
+    except KeyError:
+        raise NotImplementedError(f"Unhandled item type {object_type}") from None
 
 
 @classes.register
@@ -893,4 +1034,6 @@ class PSO2_OT_SelectAllCategories(bpy.types.Operator):
 
 
 def _get_all_enum_items(obj: bpy.types.bpy_struct, prop: str) -> set[str]:
-    return {enum.identifier for enum in obj.bl_rna.properties[prop].enum_items.values()}  # type: ignore
+    # Enum items are keyed by identifier, so this doesn't have to read each item.
+    # Enum flag properties only accept a set, not a frozenset.
+    return set(obj.bl_rna.properties[prop].enum_items.keys())  # type: ignore
@@ -1,8 +1,10 @@
 import itertools
 import re
 import typing
+from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 import bpy
 
@@ -89,6 +91,17 @@ class Material:
             unknown_int_1=int(mat.unkInt1),
         )
 
+    @property
+    def match_key(self) -> "MaterialKey":
+        return (
+            self.name,
+            self.blend_type,
+            self.special_type,
+            self.two_sided,
+            self.alpha_cutoff,
+            tuple(self.shaders),
+        )
+
 
 @dataclass
 class TextureSet:
@@ -182,29 +195,31 @@ FBX_MATERIAL_RE = re.compile(
 )
 
 
-def find_material(key: str, materials: Iterable[Material]):
+MaterialKey = tuple[str, str, str, int, int, tuple[str, ...]]
+
+
+def parse_material_key(key: str) -> MaterialKey | None:
+    """Get the values find_material() matches on from a material name"""
     m = FBX_MATERIAL_RE.match(key)
     if not m:
         return None
 
-    name = m.group("name")
-    blend_type = m.group("blend_type")
-    special_type = m.group("special_type") or ""
-    two_sided = int(m.group("two_sided") or "0")
-    alpha_cutoff = int(m.group("alpha_cutoff") or "0")
-    shaders = m.group("shaders").split(",")
+    return (
+        m.group("name"),
+        m.group("blend_type"),
+        m.group("special_type") or "",
+        int(m.group("two_sided") or "0"),
+        int(m.group("alpha_cutoff") or "0"),
+        tuple(m.group("shaders").split(",")),
+    )
 
-    def is_match(mat: Material):
-        return (
-            mat.name == name
-            and mat.blend_type == blend_type
-            and mat.special_type == special_type
-            and mat.two_sided == two_sided
-            and mat.alpha_cutoff == alpha_cutoff
-            and mat.shaders == shaders
-        )
 
-    return next((m for m in materials if is_match(m)), None)
+def find_material(key: str, materials: Iterable[Material]):
+    match_key = parse_material_key(key)
+    if not match_key:
+        return None
+
+    return next((m for m in materials if m.match_key == match_key), None)
 
 
 def texture_has_parts(name: str, parts: str | Iterable[str]):
@@ -214,17 +229,61 @@ def texture_has_parts(name: str, parts: str | Iterable[str]):
     if isinstance(parts, str):
         parts = [parts]
 
-    split_name = name.partition(".")[0].split("_")
+    split_name = _get_texture_parts(name)
 
     return all(part in split_name for part in parts)
 
 
+@lru_cache(maxsize=1024)
+def _get_texture_parts(name: str) -> frozenset[str]:
+    # Texture lookups check the same image names over and over
+    return frozenset(name.partition(".")[0].split("_"))
+
+
 def find_textures(*parts: str, images: Iterable[bpy.types.Image] | None = None):
     images = images or bpy.data.images
 
     return [img for img in images if texture_has_parts(img.name, parts)]
 
 
+class TextureIndex:
+    """
+    Finds textures by name parts like find_textures(), but only goes through
+    the images once no matter how many lookups are made.
+    """
+
+    __slots__ = ("_by_part", "_images")
+
+    def __init__(self, images: Iterable[bpy.types.Image] | None = None):
+        self._images = images
+        self._by_part: defaultdict[str, list[bpy.types.Image]] | None = None
+
+    def find(self, *parts: str) -> list[bpy.types.Image]:
+        first, *rest = parts
+
+        return [
+            img
+            for img in self._get_index().get(first, [])
+            if texture_has_parts(img.name, rest)
+        ]
+
+    def add(self, images: Iterable[bpy.types.Image]):
+        """Add images that were created after the index was built"""
+        if self._by_part is None:
+            return
+
+        for img in images:
+            for part in _get_texture_parts(img.name):
+                self._by_part[part].append(img)
+
+    def _get_index(self):
+        if self._by_part is None:
+            self._by_part = defaultdict(list)
+            self.add(self._images or bpy.data.images)
+
+        return self._by_part
+
+
 def find_texture(*parts: str, images: Iterable[bpy.types.Image] | None = None):
     if result := find_textures(*parts, images=images):
         return result[0]
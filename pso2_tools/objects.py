@@ -5,6 +5,7 @@ from collections.abc import Callable, Generator, Iterable
 from contextlib import closing, suppress
 from dataclasses import dataclass, field, fields
 from enum import StrEnum
+from functools import cached_property
 from io import BytesIO
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, TypeVar
@@ -118,24 +119,30 @@ def is_ngs(object_id: int):
     return object_id >= NGS_START
 
 
+# [start, end) ranges of IDs for each body type
+T1_ID_RANGES = (
+    (CLASSIC_MALE_COSTUME_START, CLASSIC_FEMALE_COSTUME_START),
+    (CLASSIC_MALE_START, CLASSIC_FEMALE_START),
+    (CLASSIC_CAST_START, CLASSIC_CASEAL_START),
+    (NGS_T1_START, NGS_T2_START),
+    (NGS_CAST_START, NGS_CASEAL_START),
+)
+
+T2_ID_RANGES = (
+    (CLASSIC_FEMALE_COSTUME_START, CLASSIC_MALE_START),
+    (CLASSIC_FEMALE_START, CLASSIC_CAST_START),
+    (CLASSIC_CASEAL_START, CLASSIC_UNKNOWN_START),
+    (NGS_T2_START, NGS_CAST_START),
+    (NGS_CASEAL_START, NGS_GENDERLESS_START),
+)
+
+
 def is_t1(object_id: int):
-    return (
-        CLASSIC_MALE_COSTUME_START <= object_id < CLASSIC_FEMALE_COSTUME_START
-        or CLASSIC_MALE_START <= object_id < CLASSIC_FEMALE_START
-        or CLASSIC_CAST_START <= object_id < CLASSIC_CASEAL_START
-        or NGS_T1_START <= object_id < NGS_T2_START
-        or NGS_CAST_START <= object_id < NGS_CASEAL_START
-    )
+    return any(start <= object_id < end for start, end in T1_ID_RANGES)
 
 
 def is_t2(object_id: int):
-    return (
-        CLASSIC_FEMALE_COSTUME_START <= object_id < CLASSIC_MALE_START
-        or CLASSIC_FEMALE_START <= object_id < CLASSIC_CAST_START
-        or CLASSIC_CASEAL_START <= object_id < CLASSIC_UNKNOWN_START
-        or NGS_T2_START <= object_id < NGS_CAST_START
-        or NGS_CASEAL_START <= object_id < NGS_GENDERLESS_START
-    )
+    return any(start <= object_id < end for start, end in T2_ID_RANGES)
 
 
 def is_genderless(object_id: int):
@@ -500,6 +507,10 @@ class CmxObjectBase:
     def get_colors(self) -> set[ColorId]:
         return self.get_color_map().get_used_colors()
 
+    @cached_property
+    def sorted_colors(self) -> tuple[ColorId, ...]:
+        return tuple(sorted(self.get_colors()))
+
     def get_color_map(self) -> ColorMapping:
         return ColorMapping()
 
@@ -707,6 +718,14 @@ class CmxHornObject(CmxObjectWithFile):
 class ObjectDatabase:
     VERSION = 7
 
+    # Finding an object by file hash scans every table and hashes each file
+    # name, so results are kept until the database is updated.
+    _objects_by_hash: dict[str, CmxObjectBase | None] = {}
+
+    # Incremented whenever the database is rebuilt, so anything caching query
+    # results can tell when they are out of date.
+    generation = 0
+
     def __init__(self, context: bpy.types.Context):
         self.context = context
         self.con = self._open_db()
@@ -720,6 +739,13 @@ class ObjectDatabase:
         for object_type, cls in _object_types.items():
             yield from self._get_objects(cls, object_type, item_id, file_hash)
 
+    def find_by_file_hash(self, file_hash: str) -> CmxObjectBase | None:
+        cache = ObjectDatabase._objects_by_hash
+        if file_hash not in cache:
+            cache[file_hash] = next(self.get_all(file_hash=file_hash), None)
+
+        return cache[file_hash]
+
     def get_accessories(self, item_id: int | None = None, file_hash: str | None = None):
         return self._get_objects(CmxAccessory, ObjectType.ACCESSORY, item_id, file_hash)
 
@@ -843,6 +869,9 @@ class ObjectDatabase:
 
         colors = _get_ccl(bin_path)
 
+        ObjectDatabase._objects_by_hash.clear()
+        ObjectDatabase.generation += 1
+
         with self.con:
             self._reset_db()
 
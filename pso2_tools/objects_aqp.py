@@ -75,6 +75,12 @@ class AqpDataFile:
     def data(self) -> bytes:
         return self.path.read_bytes()
 
+    def to_byte_array(self):
+        # Read straight into a .NET array instead of copying from Python bytes
+        from System.IO import File
+
+        return File.ReadAllBytes(str(self.path))
+
 
 class AqpDataFileSource:
     def __init__(self, path: Path):
@@ -1,4 +1,5 @@
-from collections.abc import Sequence
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
 
 import bpy
 
@@ -20,7 +21,7 @@ class OBJECT_OT_pso2_rename_bones(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        return any(_get_bones_with_ids_in_names())
+        return _poll_cached("ids_in_names", _get_bones_with_ids_in_names)
 
     def execute(self, context) -> OperatorResult:
         bones = list(_get_bones_with_ids_in_names())
@@ -52,7 +53,7 @@ class OBJECT_OT_pso2_restore_bones(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        return any(_get_bones_with_id_props())
+        return _poll_cached("id_props", _get_bones_with_id_props)
 
     def execute(self, context) -> OperatorResult:
         bones = list(_get_bones_with_id_props())
@@ -77,26 +78,70 @@ def menu_func(self: bpy.types.Operator, context: bpy.types.Context):
     self.layout.operator(OBJECT_OT_pso2_restore_bones.bl_idname)
 
 
+# poll() runs every time the menu is drawn and has to look at every bone, so
+# its result is kept until the scene changes. Only the result is kept: bone
+# references can go stale after undo, so execute() always scans again.
+_poll_results: dict[str, bool] = {}
+
+
+def _poll_cached(key: str, get_bones: Callable[[], Iterable[bpy.types.Bone]]):
+    if key not in _poll_results:
+        _poll_results[key] = any(get_bones())
+
+    return _poll_results[key]
+
+
+@bpy.app.handlers.persistent
+def _clear_poll_results(*args):
+    _poll_results.clear()
+
+
+_CLEAR_HANDLERS = (
+    bpy.app.handlers.depsgraph_update_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
+def register_handlers():
+    for handlers in _CLEAR_HANDLERS:
+        if _clear_poll_results not in handlers:
+            handlers.append(_clear_poll_results)
+
+
+def unregister_handlers():
+    for handlers in _CLEAR_HANDLERS:
+        if _clear_poll_results in handlers:
+            handlers.remove(_clear_poll_results)
+
+    _poll_results.clear()
+
+
+def _get_armatures():
+    # Going through the armatures rather than the objects visits each one
+    # once, even when several objects share it. Skip orphans that nothing
+    # uses and linked armatures, which can't be edited.
+    for armature in bpy.data.armatures:
+        if armature.users and armature.library is None:
+            yield armature
+
+
 def _get_bones_with_ids_in_names():
-    for obj in bpy.data.objects:
-        if not isinstance(obj.data, bpy.types.Armature):
-            continue
-
-        for bone in obj.data.bones:
-            if any(
-                pattern.match(bone.name)
-                for pattern in (fbx_wrapper.BONE_PATTERN, fbx_wrapper.BONE_PATTERN_2)
-            ):
-                yield bone
+    for armature in _get_armatures():
+        bones = armature.bones
 
+        # keys() fetches every name in one call instead of one RNA access per
+        # bone, so only the bones that match need to be looked up.
+        for name in bones.keys():  # noqa: SIM118
+            if fbx_wrapper.has_bone_id(name):
+                yield bones[name]
 
-def _get_bones_with_id_props():
-    for obj in bpy.data.objects:
-        if not isinstance(obj.data, bpy.types.Armature):
-            continue
 
-        for bone in obj.data.bones:
-            if scene_props.BONE_ID in bone:
+def _get_bones_with_id_props():
+    for armature in _get_armatures():
+        for bone in armature.bones:
+            if bone.get(scene_props.BONE_ID) is not None:
                 yield bone
 
 
@@ -107,22 +152,18 @@ def _find_duplicate_bones(bones: Sequence[bpy.types.Bone]) -> list[str]:
     models open at once share every name between them. Comparing across
     the whole file called that a clash and refused to do anything.
     """
-    seen: dict[str, set[str]] = {}
-    dupes: list[str] = []
-
-    for bone in bones:
-        armature = bone.id_data
-        renamed = (
-            result[0]
-            if (result := fbx_wrapper.split_bone_name(bone.name))
-            else bone.name
-        )
-        within = seen.setdefault(armature.name, set())
-        if renamed in within:
-            dupes.append(f"{armature.name}: {renamed}")
-        within.add(renamed)
-
-    return dupes
+    counts = Counter((bone.id_data.name, _get_name_without_id(bone)) for bone in bones)
+
+    return [
+        f"{armature}: {renamed}" for (armature, renamed), n in counts.items() if n > 1
+    ]
+
+
+def _get_name_without_id(bone: bpy.types.Bone):
+    if result := fbx_wrapper.split_bone_name(bone.name):
+        return result[0]
+
+    return bone.name
 
 
 def _duplicate_message(dupes: Sequence[str], limit: int = 6) -> str:
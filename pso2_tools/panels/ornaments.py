@@ -1,16 +1,22 @@
+from collections import defaultdict
+
 import bpy
 
 from .. import classes, parts, util
 
-ORNAMENT_MESHES = [
-    parts.MeshId.Ornament1,
-    parts.MeshId.Ornament2,
-    parts.MeshId.HeadOrnament,
-    parts.MeshId.CastBodyOrnament,
-    parts.MeshId.CastLegsOrnament,
-    parts.MeshId.CastArmsOrnament,
-    parts.MeshId.OuterOrnament,
-]
+ORNAMENT_MESHES = frozenset(
+    [
+        parts.MeshId.Ornament1,
+        parts.MeshId.Ornament2,
+        parts.MeshId.HeadOrnament,
+        parts.MeshId.CastBodyOrnament,
+        parts.MeshId.CastLegsOrnament,
+        parts.MeshId.CastArmsOrnament,
+        parts.MeshId.OuterOrnament,
+    ]
+)
+
+OrnamentMeshes = dict[parts.MeshId, list[bpy.types.Object]]
 
 
 @classes.register
@@ -24,7 +30,7 @@ class PSO2OrnamentsPanel(bpy.types.Panel):
     @classmethod
     def poll(cls, context):
         return any(
-            parts.get_mesh_id(obj.name) in ORNAMENT_MESHES
+            "mesh[" in (name := obj.name) and parts.get_mesh_id(name) in ORNAMENT_MESHES
             for obj in bpy.data.objects
             if obj.type == "MESH"
         )
@@ -33,21 +39,25 @@ class PSO2OrnamentsPanel(bpy.types.Panel):
         assert self.layout is not None
 
         layout = self.layout
+        meshes = collect_ornament_meshes()
 
         draw_toggle(
             layout,
+            meshes,
             "Basewear 1",
             PSO2_OT_ShowOrnamentBasewear1,
             PSO2_OT_HideOrnamentBasewear1,
         )
         draw_toggle(
             layout,
+            meshes,
             "Basewear 2",
             PSO2_OT_ShowOrnamentBasewear2,
             PSO2_OT_HideOrnamentBasewear2,
         )
         draw_toggle(
             layout,
+            meshes,
             "Outerwear",
             PSO2_OT_ShowOrnamentOuterwear,
             PSO2_OT_HideOrnamentOuterwear,
@@ -57,6 +67,7 @@ class PSO2OrnamentsPanel(bpy.types.Panel):
 
         draw_toggle(
             layout,
+            meshes,
             "Hair/Head Parts",
             PSO2_OT_ShowOrnamentHair,
             PSO2_OT_HideOrnamentHair,
@@ -64,6 +75,7 @@ class PSO2OrnamentsPanel(bpy.types.Panel):
 
         draw_toggle(
             layout,
+            meshes,
             "Body Parts",
             PSO2_OT_ShowOrnamentCastBody,
             PSO2_OT_HideOrnamentCastBody,
@@ -71,6 +83,7 @@ class PSO2OrnamentsPanel(bpy.types.Panel):
 
         draw_toggle(
             layout,
+            meshes,
             "Arm Parts",
             PSO2_OT_ShowOrnamentCastArm,
             PSO2_OT_HideOrnamentCastArm,
@@ -78,6 +91,7 @@ class PSO2OrnamentsPanel(bpy.types.Panel):
 
         draw_toggle(
             layout,
+            meshes,
             "Leg Parts",
             PSO2_OT_ShowOrnamentCastLeg,
             PSO2_OT_HideOrnamentCastLeg,
@@ -86,33 +100,50 @@ class PSO2OrnamentsPanel(bpy.types.Panel):
 
 def draw_toggle(
     layout: bpy.types.UILayout,
+    meshes: OrnamentMeshes,
     label: str,
     show: type["PSO2_OT_ShowOrnament"],
     hide: type["PSO2_OT_HideOrnament"],
 ):
-    if not show.is_enabled():
+    objs = meshes.get(show.mesh_id)
+    if not objs:
         return
 
+    hidden = [obj.hide_get() for obj in objs]
+
     row = layout.row(align=True)
     row.label(text=label)
-    row.operator(show.bl_idname, depress=show.is_depressed())
-    row.operator(hide.bl_idname, depress=hide.is_depressed())
+    row.operator(show.bl_idname, depress=not any(hidden))
+    row.operator(hide.bl_idname, depress=all(hidden))
+
 
+def collect_ornament_meshes() -> OrnamentMeshes:
+    """Get every ornament mesh object in one pass, grouped by mesh ID"""
+    result: OrnamentMeshes = defaultdict(list)
 
-def has_ornament_mesh(mesh_id: parts.MeshId):
-    return any(
-        parts.get_mesh_id(obj.name) == mesh_id
-        for obj in bpy.data.objects
-        if obj.type == "MESH"
-    )
+    for obj in bpy.data.objects:
+        if obj.type != "MESH":
+            continue
+
+        mesh_id = parts.get_mesh_id(obj.name)
+        if mesh_id in ORNAMENT_MESHES:
+            result[mesh_id].append(obj)
+
+    return result
 
 
 def get_ornament_mesh_objects(mesh_id: parts.MeshId):
-    return [
-        obj
-        for obj in bpy.data.objects
-        if obj.type == "MESH" and parts.get_mesh_id(obj.name) == mesh_id
-    ]
+    return collect_ornament_meshes().get(mesh_id, [])
+
+
+def set_ornament_hidden(
+    context: bpy.types.Context, mesh_id: parts.MeshId, hidden: bool
+):
+    # Resolve the view layer once instead of letting each hide_set() look it up
+    view_layer = context.view_layer
+
+    for mesh in get_ornament_mesh_objects(mesh_id):
+        mesh.hide_set(hidden, view_layer=view_layer)
 
 
 def find_context_area():
@@ -131,20 +162,10 @@ class PSO2_OT_ShowOrnament(bpy.types.Operator):
     mesh_id: parts.MeshId
 
     def execute(self, context) -> util.OperatorResult:
-        for mesh in get_ornament_mesh_objects(self.mesh_id):
-            mesh.hide_set(False)
+        set_ornament_hidden(context, self.mesh_id, False)
 
         return {"FINISHED"}
 
-    @classmethod
-    def is_enabled(cls) -> bool:
-        return has_ornament_mesh(cls.mesh_id)
-
-    @classmethod
-    def is_depressed(cls) -> bool:
-        meshes = get_ornament_mesh_objects(cls.mesh_id)
-        return bool(meshes) and all(not mesh.hide_get() for mesh in meshes)
-
 
 class PSO2_OT_HideOrnament(bpy.types.Operator):
     bl_label = "Hide"
@@ -152,16 +173,10 @@ class PSO2_OT_HideOrnament(bpy.types.Operator):
     mesh_id: parts.MeshId
 
     def execute(self, context) -> util.OperatorResult:
-        for mesh in get_ornament_mesh_objects(self.mesh_id):
-            mesh.hide_set(True)
+        set_ornament_hidden(context, self.mesh_id, True)
 
         return {"FINISHED"}
 
-    @classmethod
-    def is_depressed(cls) -> bool:
-        meshes = get_ornament_mesh_objects(cls.mesh_id)
-        return bool(meshes) and all(mesh.hide_get() for mesh in meshes)
-
 
 @classes.register
 class PSO2_OT_ShowOrnamentBasewear1(PSO2_OT_ShowOrnament):
@@ -1,5 +1,6 @@
 import re
 from enum import IntEnum
+from functools import lru_cache
 
 import bpy
 
@@ -41,11 +42,14 @@ MESH_ID_NAMES = {
 }
 
 
-MESH_ID_RE = re.compile(r"mesh\[\d+\]_.*#.*#(\d+)$")
-MESH_ID_SUB_RE = re.compile(r"(?<=#)\d+(?=(?:\.\d+)?$)")
+MESH_ID_RE = re.compile(r"mesh\[\d+\]_[^#]*#.*#(\d+)$")
 
 
+@lru_cache(maxsize=4096)
 def get_mesh_id(name: str) -> MeshId | None:
+    if "mesh[" not in name:
+        return None
+
     if m := MESH_ID_RE.search(util.remove_blender_suffix(name)):
         return MeshId(int(m.group(1)))
 
@@ -53,9 +57,20 @@ def get_mesh_id(name: str) -> MeshId | None:
 
 
 def set_mesh_id(obj: bpy.types.Object, mesh_id: MeshId):
-    new_obj_name = MESH_ID_SUB_RE.sub(str(mesh_id), obj.name)
-    new_mesh_name = MESH_ID_SUB_RE.sub(f"{mesh_id}_mesh", obj.name)
+    new_obj_name = _replace_mesh_id(obj.name, str(mesh_id))
+    new_mesh_name = _replace_mesh_id(obj.name, f"{mesh_id}_mesh")
 
     obj.name = new_obj_name
     if obj.data:
         obj.data.name = new_mesh_name
+
+
+def _replace_mesh_id(name: str, replacement: str):
+    """Replace the number after the last # in a name, keeping any .001 suffix"""
+    base = util.remove_blender_suffix(name)
+    head, sep, old_id = base.rpartition("#")
+
+    if not sep or not old_id.isdigit():
+        return name
+
+    return f"{head}#{replacement}{name[len(base) :]}"
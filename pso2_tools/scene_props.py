@@ -80,11 +80,33 @@ def _add_material_properties():
     )
 
 
-def _add_object_properties():
-    def _enum(mesh_id: parts.MeshId):
-        name = parts.MESH_ID_NAMES[mesh_id]
-        return (str(mesh_id), name, name, int(mesh_id))
+_MESH_ID_ENUM_ITEMS = tuple(
+    (
+        str(mesh_id),
+        parts.MESH_ID_NAMES[mesh_id],
+        parts.MESH_ID_NAMES[mesh_id],
+        int(mesh_id),
+    )
+    for mesh_id in (
+        parts.MeshId.Costume,
+        parts.MeshId.BreastNeck,
+        parts.MeshId.Front,
+        parts.MeshId.Back,
+        parts.MeshId.Shoulder,
+        parts.MeshId.Forearm,
+        parts.MeshId.Legs,
+        parts.MeshId.Ornament1,
+        parts.MeshId.Ornament2,
+        parts.MeshId.OuterOrnament,
+        parts.MeshId.CastBodyOrnament,
+        parts.MeshId.CastLegsOrnament,
+        parts.MeshId.CastArmsOrnament,
+        parts.MeshId.HeadOrnament,
+    )
+)
 
+
+def _add_object_properties():
     def _get_mesh_id(self: bpy.types.Object):
         return int(parts.get_mesh_id(self.name) or 0)
 
@@ -96,22 +118,7 @@ def _add_object_properties():
         MESH_ID,
         bpy.props.EnumProperty(
             name="Mesh Part",
-            items=[
-                _enum(parts.MeshId.Costume),
-                _enum(parts.MeshId.BreastNeck),
-                _enum(parts.MeshId.Front),
-                _enum(parts.MeshId.Back),
-                _enum(parts.MeshId.Shoulder),
-                _enum(parts.MeshId.Forearm),
-                _enum(parts.MeshId.Legs),
-                _enum(parts.MeshId.Ornament1),
-                _enum(parts.MeshId.Ornament2),
-                _enum(parts.MeshId.OuterOrnament),
-                _enum(parts.MeshId.CastBodyOrnament),
-                _enum(parts.MeshId.CastLegsOrnament),
-                _enum(parts.MeshId.CastArmsOrnament),
-                _enum(parts.MeshId.HeadOrnament),
-            ],
+            items=_MESH_ID_ENUM_ITEMS,
             get=_get_mesh_id,
             set=_set_mesh_id,
         ),
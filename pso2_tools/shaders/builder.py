@@ -27,13 +27,17 @@ def add_driver(
     assert isinstance(driver, bpy.types.FCurve)
     assert driver.driver is not None
 
-    var = driver.driver.variables.new()
+    driver_data = driver.driver
+
+    var = driver_data.variables.new()
     var.name = data_path
-    var.targets[0].id_type = id_type
-    var.targets[0].id = source
-    var.targets[0].data_path = data_path
 
-    driver.driver.expression = expression or data_path
+    var_target = var.targets[0]
+    var_target.id_type = id_type
+    var_target.id = source
+    var_target.data_path = data_path
+
+    driver_data.expression = expression or data_path
 
     return driver
 
@@ -69,6 +73,7 @@ class NodeTreeBuilder:
 
     def __init__(self, tree: bpy.types.ShaderNodeTree):
         self.tree = tree
+        self._color_outputs: dict[int, list[bpy.types.NodeSocket]] = {}
 
     def new_input(
         self,
@@ -114,7 +119,13 @@ class NodeTreeBuilder:
         if channel == ColorId.UNUSED:
             return None
 
-        return self.tree.links.new(colors.outputs[channel.value - 1], output)
+        # Each shader links several channels from the same node, so copy its
+        # outputs once rather than indexing the RNA collection for every link.
+        key = colors.as_pointer()
+        if (outputs := self._color_outputs.get(key)) is None:
+            outputs = self._color_outputs[key] = list(colors.outputs)
+
+        return self.tree.links.new(outputs[channel.value - 1], output)
 
     def add_node(
         self,
@@ -150,12 +161,18 @@ class NodeTreeGroupBuilder(NodeTreeBuilder):
         self.frame = super()._add_node("NodeFrame", offset, name)
 
     def _add_node(self, node_type: str, location: Vec2 | None, name: str | None):
+        # Same as NodeTreeBuilder._add_node() with the offset added, inlined
+        # since this runs for every node in a group.
         x, y = location or (0, 0)
+        offset_x, offset_y = self.offset
+
+        node = self.tree.nodes.new(node_type)
+        node.location = ((x + offset_x) * GRID, (y + offset_y) * GRID)
 
-        x += self.offset[0]
-        y += self.offset[1]
+        if name:
+            node.name = name
+            node.label = name
 
-        node = super()._add_node(node_type, (x, y), name)
         node.parent = self.frame
 
         return node
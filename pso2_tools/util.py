@@ -39,4 +39,8 @@ BLENDER_SUFFIX_RE = re.compile(r"\.\d+$")
 
 
 def remove_blender_suffix(name: str):
+    # Most names have no suffix, so skip the regex when it can't match
+    if not name[-1:].isdigit() or "." not in name:
+        return name
+
     return BLENDER_SUFFIX_RE.sub("", name)
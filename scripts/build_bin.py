@@ -4,10 +4,14 @@ Build .net dependencies.
 """
 
 import argparse
+import hashlib
 import json
+import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent
@@ -23,12 +27,33 @@ VSWHERE = Path("C:/Program Files (x86)/Microsoft Visual Studio/Installer/vswhere
 FBX_SRC = Path("C:/Program Files/Autodesk/FBX/FBX SDK/2020.1")
 FBX_DEST = ROOT / "PSO2-Aqua-Library/AquaModelLibrary.Native/Dependencies/FBX"
 BIN_PATH = ROOT / "pso2_tools/bin"
+BUILD_FINGERPRINT = BIN_PATH / ".build_fingerprint"
 
 AQUA_SLN = ROOT / "PSO2-Aqua-Library/AquaModelLibrary.sln"
 AQUA_CORE_PATH = ROOT / "PSO2-Aqua-Library/AquaModelLibrary.Core"
 
 STUB_GENERATOR_SLN = ROOT / "pythonnet-stub-generator/csharp/PythonNetStubGenerator.sln"
 
+SOURCE_SUFFIXES = {
+    # C#
+    ".cs",
+    ".csproj",
+    # C++/CLI (AquaModelLibrary.Native)
+    ".c",
+    ".cpp",
+    ".h",
+    ".hpp",
+    ".vcxproj",
+    # Shared build configuration
+    ".props",
+    ".targets",
+    ".sln",
+}
+SOURCE_NAMES = {"packages.config"}
+
+# Folders the build writes to, which don't affect its output
+BUILD_OUTPUT_DIRS = {"bin", "obj"}
+
 PACKAGES_PATH = ROOT / "packages"
 PACKAGES = [
     ("BouncyCastle.Cryptography", "2.4.0"),
@@ -95,6 +120,8 @@ def copy_package_dlls():
         "netstandard1.3",
     ]
 
+    copies: list[tuple[Path, Path]] = []
+
     for package, version in PACKAGES:
         src = PACKAGES_PATH / f"{package}.{version}"
         lib = src / "lib"
@@ -103,28 +130,96 @@ def copy_package_dlls():
         if not src.exists():
             raise Exception(f"Couldn't find {src}")
 
+        # Read lib/ once rather than checking for each framework folder
         try:
-            framework = next(lib / f for f in frameworks if (lib / f).exists())
+            with os.scandir(lib) as entries:
+                available = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            available = set()
 
-            for dll in framework.glob("*.dll"):
-                shutil.copyfile(dll, BIN_PATH / dll.name)
-        except StopIteration:
-            pass
+        if framework := next((f for f in frameworks if f in available), None):
+            copies.extend(
+                (dll, BIN_PATH / dll.name) for dll in (lib / framework).glob("*.dll")
+            )
 
         for dll in runtime_x64.glob("*.dll"):
             print(" ", dll.name)
-            shutil.copyfile(dll, BIN_PATH / "x64" / dll.name)
+            copies.append((dll, BIN_PATH / "x64" / dll.name))
 
+    # Copying is I/O bound, so the copies can overlap. copy2() keeps the
+    # package's timestamps, so DLLs that didn't change don't look new to
+    # build_typings.py after copy_bin_output() mirrors them away and back.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda c: shutil.copy2(*c), copies))
 
-def call_msbuild(args: list[Path | str]):
+
+def copy_bin_output(out_path: Path, debug: bool):
+    # robocopy copies with multiple threads, and /MIR replaces the old
+    # rmtree() by only removing files that are no longer in the output.
+    exclude = [] if debug else ["/XF", "*.pdb"]
+
+    result = subprocess.call(
+        [
+            "robocopy",
+            out_path,
+            BIN_PATH,
+            "/MIR",
+            "/MT:16",
+            "/NDL",
+            "/NFL",
+            "/NJH",
+            "/NJS",
+            *exclude,
+        ]
+    )
+
+    # robocopy uses codes 0-7 for success and 8+ for failures
+    if result >= 8:
+        raise subprocess.CalledProcessError(result, "robocopy")
+
+    # /XF also keeps /MIR from purging excluded files, so remove any PDBs left
+    # behind by an earlier debug build.
+    if not debug:
+        for pdb in BIN_PATH.rglob("*.pdb"):
+            pdb.unlink()
+
+
+@cache
+def find_msbuild():
     vs = json.loads(
         subprocess.check_output(
             [VSWHERE, "-latest", "-format", "json"], encoding="utf-8"
         )
     )
-    msbuild = Path(vs[0]["installationPath"]) / "Msbuild/Current/Bin/MSBuild.exe"
+    return Path(vs[0]["installationPath"]) / "Msbuild/Current/Bin/MSBuild.exe"
+
+
+def call_msbuild(args: list[Path | str]):
+    msbuild = find_msbuild()
 
-    subprocess.check_call([msbuild, *args])
+    # Build independent projects in the solution in parallel
+    subprocess.check_call([msbuild, "-m", "-p:BuildInParallel=true", *args])
+
+
+def get_build_fingerprint(config: str):
+    """Hash of everything that affects the build output"""
+    h = hashlib.blake2b(repr((PACKAGES, FRAMEWORK, config)).encode())
+
+    # Changes to how this script builds also need a rebuild
+    h.update(Path(__file__).read_bytes())
+
+    for sln in (AQUA_SLN, STUB_GENERATOR_SLN):
+        for dirpath, dirnames, filenames in os.walk(sln.parent):
+            # Only prunes folders inside the solution, so it doesn't matter
+            # what the folders above the checkout are called
+            dirnames[:] = sorted(d for d in dirnames if d not in BUILD_OUTPUT_DIRS)
+
+            for name in sorted(filenames):
+                path = Path(dirpath, name)
+                if path.suffix in SOURCE_SUFFIXES or name in SOURCE_NAMES:
+                    h.update(f"{path}:{path.stat().st_mtime_ns}\n".encode())
+
+    return h.hexdigest()
 
 
 def main():
@@ -133,24 +228,59 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--clean", action="store_true")
     parser.add_argument("--debug", action="store_true")
+    parser.add_argument(
+        "--nuget-cache",
+        type=Path,
+        help="keep NuGet's package and HTTP caches here, e.g. for CI to restore",
+    )
 
     args = parser.parse_args()
     target = "Rebuild" if args.clean else "Build"
     config = "Debug" if args.debug else "Release"
 
-    # Set up Aqua Library dependencies
+    if args.nuget_cache:
+        # Inherited by nuget and MSBuild, which read these for their caches
+        cache_path: Path = args.nuget_cache.resolve()
+        os.environ["NUGET_PACKAGES"] = str(cache_path / "packages")
+        os.environ["NUGET_HTTP_CACHE_PATH"] = str(cache_path / "http-cache")
+
+    fingerprint = get_build_fingerprint(config)
+    if not args.clean and (
+        BUILD_FINGERPRINT.exists() and BUILD_FINGERPRINT.read_text() == fingerprint
+    ):
+        print("Build is up to date")
+        return
+
+    # Set up Aqua Library dependencies and restore the stub generator's.
+    # None of these depend on each other, only the builds below do.
     # Use junction points instead of symlinks so Git sees them as directories
     # and they fit PSO2-Aqua-Library's .gitignore patterns.
-    make_junction(FBX_SRC / "lib", FBX_DEST / "lib")
-    make_junction(FBX_SRC / "include", FBX_DEST / "include")
+    with ThreadPoolExecutor() as executor:
+        setup = [
+            executor.submit(make_junction, FBX_SRC / "lib", FBX_DEST / "lib"),
+            executor.submit(make_junction, FBX_SRC / "include", FBX_DEST / "include"),
+            executor.submit(install_packages),
+            executor.submit(
+                call_msbuild,
+                [
+                    STUB_GENERATOR_SLN,
+                    "-p:RestorePackagesConfig=true",
+                    "-p:RestoreUseStaticGraphEvaluation=true",
+                    "-t:Restore",
+                    "-verbosity:minimal",
+                ],
+            ),
+        ]
 
-    install_packages()
+        for task in setup:
+            task.result()
 
     # Build Aqua Library
     call_msbuild(
         [
             AQUA_SLN,
             "-p:RestorePackagesConfig=true",
+            "-p:RestoreUseStaticGraphEvaluation=true",
             f"-p:Configuration={config}",
             f"-t:{target}",
             "-verbosity:minimal",
@@ -161,10 +291,7 @@ def main():
     # Copy to pso2_tools/bin folder
     out_path = AQUA_CORE_PATH / "bin" / config / FRAMEWORK
 
-    ignore = None if args.debug else shutil.ignore_patterns("*.pdb")
-
-    shutil.rmtree(BIN_PATH, ignore_errors=True)
-    shutil.copytree(out_path, BIN_PATH, dirs_exist_ok=True, ignore=ignore)
+    copy_bin_output(out_path, debug=args.debug)
 
     copy_package_dlls()
 
@@ -172,14 +299,14 @@ def main():
     call_msbuild(
         [
             STUB_GENERATOR_SLN,
-            "-p:RestorePackagesConfig=true",
             "-p:Configuration=Release",
             f"-t:{target}",
             "-verbosity:minimal",
-            "-restore",
         ]
     )
 
+    BUILD_FINGERPRINT.write_text(fingerprint)
+
 
 if __name__ == "__main__":
     main()
@@ -11,6 +11,7 @@ from pathlib import Path
 
 ROOT_PATH = Path(__file__).parent.parent
 TYPES_PATH = ROOT_PATH / "typings"
+TYPES_STAMP = TYPES_PATH / ".stamp"
 BIN_PATH = ROOT_PATH / "pso2_tools/bin"
 
 DLLS = [
@@ -36,9 +37,26 @@ STUB_GENERATOR = (
 
 
 def main():
+    # The stubs only change when the DLLs or the generator do
+    stamp = str(
+        max(
+            (
+                path.stat().st_mtime_ns
+                for path in (*DLLS, STUB_GENERATOR)
+                if path.exists()
+            ),
+            default=0,
+        )
+    )
+
+    if TYPES_STAMP.exists() and TYPES_STAMP.read_text() == stamp:
+        print("Typings are up to date")
+        return
+
     shutil.rmtree(TYPES_PATH, ignore_errors=True)
 
-    subprocess.call([STUB_GENERATOR, "-o", TYPES_PATH, *DLLS])
+    if subprocess.call([STUB_GENERATOR, "-o", TYPES_PATH, *DLLS]) == 0:
+        TYPES_STAMP.write_text(stamp)
 
 
 if __name__ == "__main__":
@@ -5,7 +5,6 @@ Download wheels for the project's dependencies.
 
 import shutil
 import subprocess
-from itertools import product
 from pathlib import Path
 
 import tomlkit
@@ -21,22 +20,31 @@ PYTHON_VERSIONS = ["3.11", "3.13"]
 PLATFORMS = ["win_amd64"]
 
 
+def download(deps: list[str], version: str):
+    return subprocess.call(
+        [
+            "pip",
+            "download",
+            *deps,
+            "--dest",
+            WHEELS,
+            "--only-binary=:all:",
+            f"--python-version={version}",
+            *(f"--platform={platform}" for platform in PLATFORMS),
+        ]
+    )
+
+
 def main():
     shutil.rmtree(WHEELS, ignore_errors=True)
 
-    for dep, version, platform in product(DEPENDENCIES, PYTHON_VERSIONS, PLATFORMS):
-        subprocess.call(
-            [
-                "pip",
-                "download",
-                dep,
-                "--dest",
-                WHEELS,
-                "--only-binary=:all:",
-                f"--python-version={version}",
-                f"--platform={platform}",
-            ]
-        )
+    # pip takes one Python version per call, but any number of dependencies
+    # and platforms, so only start it once per version. If that fails, retry
+    # each dependency on its own so one missing wheel doesn't lose the rest.
+    for version in PYTHON_VERSIONS:
+        if download(DEPENDENCIES, version) != 0:
+            for dep in DEPENDENCIES:
+                download([dep], version)
 
     manifest = tomlkit.parse(MANIFEST.read_text())
 